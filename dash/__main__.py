@@ -0,0 +1,9 @@
+"""Command-line interface, see :mod:`dash.cli`"""
+
+# standard library
+import sys
+
+# local library
+import dash.cli
+
+sys.exit(dash.cli.main())
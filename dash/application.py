@@ -1,15 +1,21 @@
 
-# standard library
-import os
-import subprocess
+"""Launching of workspaces
+
+Independent of Qt, such that it may be imported by scripts and
+command-line tools without loading the GUI.
+
+"""
 
 # pifou library
 import pifou.lib
-import pifou.metadata
 
 # local library
-import dash.model
-import dash.controller
+import dash.plan
+import dash.scan
+import dash.trace
+import dash.inherit
+import dash.launcher
+import dash.settings
 
 
 @pifou.lib.log
@@ -19,13 +25,27 @@ class Dash(object):
     def __init__(self):
         self.model = None
         self.controller = None
+        self.plans = dash.plan.PlanCache()
+        self.launcher = dash.launcher.Launcher(
+            self.plans,
+            workers=dash.settings.LAUNCH_WORKERS,
+            unique=dash.settings.LAUNCH_UNIQUE,
+            interval=dash.settings.LAUNCH_INTERVAL)
 
     def set_controller(self, controller):
         self.controller = controller
         controller.launch.connect(self.launch_listener)
+        controller.quick_launch.connect(self.launch_path)
+
+        # Called from background threads, forwarded onto
+        # the GUI thread by way of the controller's signals.
+        self.launcher.started.connect(controller.launch_started.emit)
+        self.launcher.finished.connect(controller.launch_finished.emit)
+        self.launcher.failed.connect(controller.launch_failed.emit)
 
     def set_model(self, model):
         self.model = model
+        model.loaded.connect(self.warm_listener)
 
         if self.controller:
             self.controller.set_model(model)
@@ -45,62 +65,31 @@ class Dash(object):
         path = self.model.data(index, 'path')
         self.launch_path(path)
 
+    @dash.trace.timed('application.launch_path')
     def launch_path(self, path):
-        basename = os.path.basename(path)
-        application, _ = os.path.splitext(basename)
-
-        cmd = list()
-
-        exe = pifou.lib.where(application)
-        if not exe:
-            self.log.info("Application '{0}' could "
-                          "not be found".format(application))
-            return False
-
-        cmd.append(exe)
-
-        location = pifou.metadata.Location(path)
-
-        # Get arguments
-        args = pifou.metadata.entry(location, "apps/"
-                                              + application
-                                              + "/args")
-        pifou.metadata.inherit(args)
+        """Launch workspace at `path` in the background
 
-        for arg in args:
-            pifou.metadata.inherit(arg)
-            cmd.append(arg.path.name)
+        Returns:
+            dash.worker.Task or None if the launch was refused
 
-        # Get keyword arguments
-        args = pifou.metadata.entry(location, "apps/"
-                                              + application
-                                              + "/kwargs")
-        pifou.metadata.inherit(args)
+        """
 
-        for arg in args:
-            pifou.metadata.inherit(arg)
-            cmd.append(arg.path.name)
-            cmd.append(arg.value)
-            self.log.info("Inheriting from kwarg: %s" % arg.path)
+        return self.launcher.launch(path)
 
-        # Resolve keywords
-        keywords = {
-            '$workspace': path,
-        }
+    def warm_listener(self, index):
+        """Pre-resolve plans for workspaces within `index`
 
-        for part in cmd:
-            index = cmd.index(part)
-            part = str(part).lower()
+        Arguments:
+            index (str): Index of parent, whose children were loaded
 
-            try:
-                keyword = keywords[part]
-                cmd[index] = keyword
+        """
 
-            except KeyError:
-                pass
+        paths = list()
+        for child in self.model.item(index).children:
+            if child.data('type') == dash.scan.WORKSPACE:
+                paths.append(child.data('path'))
 
-        self.log.info("Running %s" % cmd)
-        subprocess.Popen(cmd)
+        self.plans.warm(paths)
 
     def kwargs_from_workspace(self, root, application):
         """Fetch keyword arguments from `root` for `application`
@@ -108,9 +97,12 @@ class Dash(object):
         Arguments:
             root (str): Absolute path to workspace
 
+        Returns:
+            list: (key, value) pairs, inherited from parents
+
         """
 
-        raise NotImplemented
+        return dash.inherit.resolver.kwargs(root, application)
 
     def args_from_workspace(self, root, application):
         """Fetch arguments from `root` for `application`
@@ -118,9 +110,12 @@ class Dash(object):
         Arguments:
             root (str): Absolute path to workspace
 
+        Returns:
+            list: Arguments, inherited from parents
+
         """
 
-        raise NotImplemented
+        return dash.inherit.resolver.args(root, application)
 
     def environment_from_workspace(self, root, application):
         """Fetch environment settings from `root` for `application`
@@ -128,14 +123,19 @@ class Dash(object):
         Arguments:
             root (str): Absolute path to workspace
 
-        """
+        Returns:
+            dict: Variables, inherited from parents
 
-        raise NotImplemented
+        """
 
+        return dash.inherit.resolver.environment(root, application)
 
 if __name__ == '__main__':
     import pigui.pyqt5.util
 
+    import dash.model
+    import dash.controller
+
     with pigui.pyqt5.util.application_context():
         win = dash.controller.Dash()
 
@@ -0,0 +1,557 @@
+"""Benchmarks for Dash
+
+Synthetic content trees are generated in a temporary directory and
+the time spent pulling, looking up data, filtering and resolving
+launches is measured, along with memory per item. Runs headless,
+via Qt's offscreen platform, and results are written as JSON for
+comparison between runs.
+
+Usage:
+    $ python -m dash.benchmark --output before.json
+    $ python -m dash.benchmark --output after.json --compare before.json
+
+"""
+
+# standard library
+import os
+import sys
+import json
+import time
+import stat
+import types
+import shutil
+import timeit
+import argparse
+import tempfile
+import functools
+
+# Must be set prior to Qt being imported
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# pifou library
+import pifou.metadata
+import pifou.domain.workspace
+
+# pigui library
+import pigui.pyqt5.model
+
+# pigui dependency
+from PyQt5 import QtWidgets
+
+# local library
+import dash.cache
+import dash.model
+import dash.filter
+import dash.inherit
+import dash.version
+import dash.settings
+import dash.application
+
+APPLICATION = 'maya'
+
+# Objects never attributed to an item
+_ignored = (type, types.ModuleType, types.FunctionType,
+            types.BuiltinFunctionType)
+
+
+def sizeof(objects, exclude=()):
+    """Return bytes occupied by `objects` and everything they reference
+
+    Objects shared between `objects`, such as interned strings,
+    are only counted once.
+
+    Arguments:
+        objects (list): Objects to measure
+        exclude (list): Objects, and anything referenced only
+            through them, not to measure.
+
+    """
+
+    seen = set(id(obj) for obj in exclude)
+    stack = list(objects)
+    total = 0
+
+    while stack:
+        obj = stack.pop()
+
+        if id(obj) in seen or isinstance(obj, _ignored):
+            continue
+
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+
+            for cls in type(obj).__mro__:
+                for slot in getattr(cls, '__slots__', ()):
+                    if hasattr(obj, slot):
+                        stack.append(getattr(obj, slot))
+
+    return total
+
+
+def synthetic_data(root, count):
+    """Yield data of `count` items, as created by Model.pull"""
+    for number in range(count):
+        name = 'shot_%04d' % number
+        yield {'type': 'disk',
+               'path': os.path.join(root, name),
+               'display': name,
+               'group': True}
+
+
+def item_memory(count=10000, root='/projects/job/sequence'):
+    """Return bytes per item, for plain and Dash items
+
+    Returns:
+        dict: {"before": bytes, "after": bytes}, where "before" is
+            the general-purpose pigui item and "after" is
+            :class:`dash.model.Item`.
+
+    """
+
+    results = dict()
+
+    for name, cls in (('before', pigui.pyqt5.model.ModelItem),
+                      ('after', dash.model.Item)):
+        parent = cls({'type': 'disk', 'path': root})
+        items = [cls(data, parent=parent)
+                 for data in synthetic_data(root, count)]
+
+        results[name] = sizeof(items, exclude=[parent]) / float(count)
+
+    return results
+
+
+def measure(func, repeat=5, setup=None):
+    """Time `func`, `repeat` times
+
+    Arguments:
+        func (callable): Function to time
+        repeat (int): Number of runs
+        setup (callable, optional): Called prior to each run,
+            excluded from timing.
+
+    Returns:
+        dict: Seconds; min, median and mean
+
+    """
+
+    times = list()
+
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+
+        start = timeit.default_timer()
+        func()
+        times.append(timeit.default_timer() - start)
+
+    times.sort()
+    return {'min': times[0],
+            'median': times[len(times) // 2],
+            'mean': sum(times) / len(times),
+            'repeat': repeat}
+
+
+def imprint(path, *keys, **kwargs):
+    """Write metadata `keys`, nested, to `path`
+
+    Example:
+        >>> imprint(path, 'apps', 'maya', 'args', '-proj')
+
+    """
+
+    location = pifou.metadata.Location(path)
+
+    entry = location
+    for key in keys:
+        entry = pifou.metadata.Entry(key, parent=entry)
+
+    if 'value' in kwargs:
+        entry.value = kwargs['value']
+
+    pifou.metadata.flush(location)
+
+
+def generate(root,
+             width=2000,
+             depth=20,
+             metadata=500,
+             workspaces=200):
+    """Generate synthetic content tree at `root`
+
+    Returns:
+        dict: Absolute path per kind of tree; "wide", "deep",
+            "metadata" and "workspaces", along with "executable"
+            of the application of each workspace.
+
+    """
+
+    tree = dict()
+
+    # Wide; many siblings
+    path = os.path.join(root, 'wide')
+    for number in range(width):
+        os.makedirs(os.path.join(path, 'shot_%04d' % number))
+    tree['wide'] = path
+
+    # Deep; long chain of single children
+    path = os.path.join(root, 'deep')
+    os.makedirs(path)
+    tree['deep'] = path
+    for number in range(depth):
+        path = os.path.join(path, 'level_%02d' % number)
+    os.makedirs(path)
+
+    # Metadata-heavy; hidden siblings and junctions
+    path = os.path.join(root, 'metadata')
+    for number in range(metadata):
+        child = os.path.join(path, 'asset_%04d' % number)
+        os.makedirs(os.path.join(child, 'publish'))
+
+        if number % 3 == 0:
+            imprint(child, 'hidden')
+
+        if number % 5 == 0:
+            imprint(child, 'junction.string', value='publish')
+    tree['metadata'] = path
+
+    # Workspaces; one per shot, with inherited arguments
+    path = os.path.join(root, 'workspaces')
+    os.makedirs(path)
+    imprint(path, 'apps', APPLICATION, 'args', '$workspace')
+
+    for number in range(workspaces):
+        shot = os.path.join(path, 'shot_%04d' % number)
+        workspace = pifou.domain.workspace.assemble(
+            root=shot, application=APPLICATION)
+        os.makedirs(workspace)
+        imprint(workspace, 'Workspace.class')
+    tree['workspaces'] = path
+
+    # Executable, for launching
+    bindir = os.path.join(root, 'bin')
+    os.makedirs(bindir)
+
+    executable = os.path.join(bindir, APPLICATION)
+    if sys.platform == 'win32':
+        executable += '.exe'
+
+    with open(executable, 'w') as f:
+        f.write('')
+
+    os.chmod(executable, os.stat(executable).st_mode | stat.S_IEXEC)
+    tree['executable'] = executable
+
+    return tree
+
+
+def invalidate(model):
+    """Forget everything cached"""
+    model.listings.invalidate()
+    dash.cache.metadata.invalidate()
+
+
+def create_model():
+    # Only measure what is asked for, and leave the index
+    # and session of the user be
+    dash.settings.WATCH = False
+    dash.settings.WORKSPACE_INDEX = None
+    dash.settings.SESSION = None
+
+    model = dash.model.Model()
+    model.threaded = False
+
+    return model
+
+
+def descend(model, index):
+    """Pull `index` and each level below it, down single child folders
+
+    As a user would, opening one column after another.
+
+    """
+
+    while index is not None:
+        model.pull(index)
+
+        folders = [child.index for child in model.item(index).children
+                   if child.data('type') == 'disk' and child.data('group')]
+
+        index = folders[0] if len(folders) == 1 else None
+
+
+def pull(tree, repeat=5):
+    """Time Model.pull per kind of tree, with cold and warm caches
+
+    The deep tree is timed from its root all the way down, see
+    :func:`descend`, others by pulling their root alone.
+
+    """
+
+    results = dict()
+
+    for kind in ('wide', 'deep', 'metadata', 'workspaces'):
+        model = create_model()
+        model.setup(tree[kind])
+        index = model.root_item.index
+
+        if kind == 'deep':
+            run = functools.partial(descend, model, index)
+        else:
+            run = functools.partial(model.pull, index)
+
+        results[kind] = {
+            'cold': measure(run, repeat, setup=lambda: invalidate(model)),
+            'warm': measure(run, repeat)
+        }
+
+    return results
+
+
+def item_data(tree, repeat=5):
+    """Time Item.data of path, display and group, per item"""
+    model = create_model()
+    model.setup(tree['wide'])
+    index = model.root_item.index
+    model.pull(index)
+
+    items = [child for child in model.item(index).children
+             if child.data('type') == 'disk']
+
+    def read():
+        for item in items:
+            item.data('path')
+            item.data('display')
+            item.data('group')
+
+    result = measure(read, repeat)
+    result['per_item'] = result['median'] / max(1, len(items))
+    return result
+
+
+class Path(str):
+    """Stand-in for the path of a pifou node, see :class:`Node`"""
+
+    @property
+    def as_str(self):
+        return str(self)
+
+
+class Node(object):
+    """Stand-in for a pifou node, exposing what dash.filter uses"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.isparent = os.path.isdir(path)
+
+
+def filters(tree, repeat=5):
+    """Time each operator of dash.filter per node, and as a pipeline
+
+    Nodes are minimal stand-ins for pifou nodes. Junctions are
+    excluded from `pre_junction` and the pipeline, as following
+    those pulls from disk via pifou.
+
+    """
+
+    path = tree['metadata']
+    nodes = [Node(os.path.join(path, name))
+             for name in sorted(os.listdir(path))
+             if not name.startswith('.')]
+
+    plain = [node for node in nodes
+             if not dash.cache.metadata.read(node.path, 'junction')]
+
+    results = dict()
+
+    def per_node(operator, population):
+        def run():
+            for node in population:
+                operator(node)
+        return run
+
+    def per_listing(pipeline, population):
+        def run():
+            pipeline(population)
+        return run
+
+    for name, run in (
+            ('post_hide_hidden',
+             per_node(dash.filter.post_hide_hidden, nodes)),
+            ('pre_junction', per_node(dash.filter.pre_junction, plain)),
+            ('discard_files', per_node(dash.filter.discard_files, nodes)),
+            ('pipeline', per_listing(dash.filter.pipeline, plain))):
+
+        try:
+            result = {
+                'cold': measure(run, repeat,
+                                setup=dash.cache.metadata.invalidate),
+                'warm': measure(run, repeat)
+            }
+        except Exception as e:
+            result = {'error': str(e)}
+
+        results[name] = result
+
+    return results
+
+
+def launch(tree, repeat=5):
+    """Time resolution of launch plans, as made by Dash.launch_path
+
+    Spawning happens in the background, see :mod:`dash.launcher`,
+    and is not measured.
+
+    """
+
+    root = tree['workspaces']
+    paths = list()
+    for shot in sorted(os.listdir(root)):
+        if shot.startswith('.'):
+            continue
+
+        paths.append(pifou.domain.workspace.assemble(
+            root=os.path.join(root, shot), application=APPLICATION))
+
+    app = dash.application.Dash()
+
+    def run():
+        for path in paths:
+            app.plans.get(path)
+
+    def forget():
+        app.plans.invalidate()
+        dash.inherit.resolver.invalidate()
+
+    environ = os.environ.get('PATH', '')
+    os.environ['PATH'] = (os.path.dirname(tree['executable']) +
+                          os.pathsep + environ)
+
+    try:
+        result = {
+            'cold': measure(run, repeat, setup=forget),
+            'warm': measure(run, repeat)
+        }
+    finally:
+        os.environ['PATH'] = environ
+
+    for state in ('cold', 'warm'):
+        result[state]['per_launch'] = (result[state]['median'] /
+                                       max(1, len(paths)))
+
+    return result
+
+
+def run(repeat=5, **sizes):
+    """Run every benchmark and return results
+
+    Arguments:
+        repeat (int): Runs per measurement
+        sizes (dict): Passed to :func:`generate`
+
+    """
+
+    app = QtWidgets.QApplication.instance()
+    if app is None:
+        app = QtWidgets.QApplication(sys.argv)
+
+    root = tempfile.mkdtemp(prefix='dash-benchmark-')
+
+    try:
+        tree = generate(root, **sizes)
+
+        results = {
+            'pull': pull(tree, repeat),
+            'item_data': item_data(tree, repeat),
+            'filter': filters(tree, repeat),
+            'launch': launch(tree, repeat),
+            'item_memory': item_memory(),
+        }
+
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+    return {'meta': {'version': dash.version.version,
+                     'python': sys.version.split()[0],
+                     'platform': sys.platform,
+                     'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                     'repeat': repeat,
+                     'sizes': sizes},
+            'results': results}
+
+
+def flatten(results, prefix=''):
+    """Yield (name, value) for every number in nested `results`"""
+    for key, value in sorted(results.items()):
+        name = prefix + '.' + key if prefix else key
+
+        if isinstance(value, dict):
+            for pair in flatten(value, name):
+                yield pair
+
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+
+def compare(before, after):
+    """Return lines comparing results `before` and `after`"""
+    previous = dict(flatten(before['results']))
+    lines = list()
+
+    for name, value in flatten(after['results']):
+        if name not in previous or name.endswith('repeat'):
+            continue
+
+        old = previous[name]
+        ratio = value / old if old else float('inf')
+        lines.append('%-50s %12.6g -> %12.6g (%.2fx)' % (
+            name, old, value, ratio))
+
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--output', help="Write results to this file")
+    parser.add_argument('--compare', help="Compare against this file")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--width', type=int, default=2000)
+    parser.add_argument('--depth', type=int, default=20)
+    parser.add_argument('--metadata', type=int, default=500)
+    parser.add_argument('--workspaces', type=int, default=200)
+
+    args = parser.parse_args()
+
+    results = run(repeat=args.repeat,
+                  width=args.width,
+                  depth=args.depth,
+                  metadata=args.metadata,
+                  workspaces=args.workspaces)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=4, sort_keys=True))
+
+    if args.compare:
+        with open(args.compare) as f:
+            before = json.load(f)
+
+        for line in compare(before, results):
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,543 @@
+"""Caches for Dash
+
+Directories are listed over and over as the user browses back and
+forth. Listings are cached here and validated against the
+modification time of the directory, such that a revisit costs a
+single ``stat``.
+
+Attributes:
+    metadata (MetadataIndex): Index shared by the model and filters
+    junctions (JunctionResolver): Targets of junctions, shared by
+        the model and filters.
+
+"""
+
+# standard library
+import os
+import time
+import logging
+import threading
+import collections
+
+# pifou library
+import pifou.metadata
+
+# local library
+import dash.trace
+import dash.settings
+
+log = logging.getLogger('dash.cache')
+
+# Metadata of interest to Dash, see MetadataIndex
+HIDDEN = 'hidden'
+JUNCTION = 'junction'
+WORKSPACE = 'Workspace.class'
+
+# Alternative spellings of keys above
+ALIASES = {'junction.string': JUNCTION}
+
+
+class ListingCache(object):
+    """Bounded LRU-cache of directory listings, validated by mtime
+
+    Safe to use from multiple threads.
+
+    Arguments:
+        size (int): Maximum number of directories to keep
+
+    Attributes:
+        hits (int): Number of valid listings returned
+        misses (int): Number of absent or stale lookups
+
+    """
+
+    def __init__(self, size=256):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def get(self, path):
+        """Return cached listing of `path`, or None if absent or stale
+
+        Arguments:
+            path (str): Absolute path to directory
+
+        """
+
+        mtime = self.mtime(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+
+            if entry is None or mtime is None or entry[0] != mtime:
+                self.misses += 1
+                return None
+
+            # Move to the end, making it most recently used
+            del self._entries[path]
+            self._entries[path] = entry
+            self.hits += 1
+
+            return entry[1]
+
+    def peek(self, path):
+        """Return (mtime, listing) of `path` without validating it
+
+        Returns:
+            tuple or None if absent
+
+        """
+
+        with self._lock:
+            return self._entries.get(path)
+
+    def put(self, path, listing, mtime):
+        """Store `listing` of `path` as it was at `mtime`
+
+        Arguments:
+            path (str): Absolute path to directory
+            listing (object): Listing, as provided by the caller
+            mtime (float): Modification time of `path`, as
+                sampled *before* listing it.
+
+        """
+
+        if mtime is None:
+            return
+
+        with self._lock:
+            self._entries.pop(path, None)
+            self._entries[path] = (mtime, listing)
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path=None):
+        """Forget listing of `path`, or everything if `path` is None"""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+    def stats(self):
+        """Return dictionary of counters, e.g. for logging"""
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'capacity': self.size}
+
+    @staticmethod
+    def mtime(path):
+        """Return modification time of `path`, or None if inaccessible"""
+        dash.trace.count('stat')
+
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+
+class _Directory(object):
+    """Metadata of the children of a directory, see :class:`MetadataIndex`
+
+    Stamps and values are replaced, rather than altered, such that
+    dictionaries handed out remain consistent.
+
+    """
+
+    __slots__ = ('mtime', 'checked', 'stamps', 'values')
+
+    def __init__(self, mtime, checked, stamps, values):
+        self.mtime = mtime
+        self.checked = checked
+        self.stamps = stamps
+        self.values = values
+
+
+class MetadataIndex(object):
+    """Per-directory index of the metadata Dash cares about
+
+    Rather than querying :mod:`pifou.metadata` per node and key,
+    the children of a directory are indexed in one pass; each child's
+    ``.meta`` is listed once and only keys actually present are read.
+    Lookups are then answered from memory.
+
+    A directory is re-indexed when its own modification time changes,
+    and a child is re-read when the modification time of its ``.meta``
+    changes. Every child is validated once per call to
+    :meth:`directory`, typically once per listing, whereas a lookup of
+    a single node validates that node alone; the modification time of
+    its directory is then trusted for `ttl` seconds.
+
+    Safe to use from multiple threads.
+
+    Arguments:
+        size (int): Maximum number of directories to keep
+        ttl (float): Seconds during which lookups of single nodes
+            trust their directory to be unchanged.
+
+    """
+
+    keys = (HIDDEN, JUNCTION, WORKSPACE)
+
+    def __init__(self, size=256, ttl=1.0):
+        self.size = size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._directories = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def find(self, path, key):
+        """Return whether `key` is present for `path`
+
+        Equivalent to :func:`pifou.metadata.find`
+
+        """
+
+        key = ALIASES.get(key, key)
+        return key in self.node(path)
+
+    def read(self, path, key):
+        """Return value of `key` for `path`, or None
+
+        Equivalent to :func:`pifou.metadata.read`
+
+        Arguments:
+            path (str): Absolute path to node
+            key (str): One of :attr:`keys`
+
+        """
+
+        key = ALIASES.get(key, key)
+        return self.node(path).get(key)
+
+    def node(self, path):
+        """Return {key: value} of metadata present for `path`"""
+        path = path.rstrip('/\\')
+        dirname, basename = os.path.split(path)
+
+        entry, indexed = self._entry(dirname, ttl=self.ttl)
+        if not indexed:
+            self._validate(dirname, entry, [basename])
+
+        return entry.values.get(basename, {})
+
+    def directory(self, path, basenames=None):
+        """Return metadata for all children of `path`
+
+        Arguments:
+            path (str): Absolute path to directory
+            basenames (list, optional): Children of `path` which may
+                carry metadata, if already known; saves listing
+                `path` once more.
+
+        Returns:
+            dict: Mapping of basename to {key: value}, children
+                without metadata of interest are excluded.
+
+        """
+
+        entry, indexed = self._entry(path, basenames)
+        if not indexed:
+            self._validate(path, entry, list(entry.stamps))
+
+        return entry.values
+
+    def peek(self, path):
+        """Return metadata of the children of `path` as last indexed
+
+        Neither validated nor indexed anew, and so free of disk access.
+
+        Returns:
+            dict or None if `path` has not been indexed
+
+        """
+
+        with self._lock:
+            entry = self._directories.get(path)
+
+        return entry.values if entry is not None else None
+
+    def invalidate(self, path=None):
+        """Forget metadata of the children of `path`, or everything"""
+        with self._lock:
+            if path is None:
+                self._directories.clear()
+            else:
+                self._directories.pop(path, None)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._directories),
+                    'capacity': self.size}
+
+    def _entry(self, path, basenames=None, ttl=0):
+        """Return index of `path`, indexing it anew if outdated
+
+        Returns:
+            tuple: _Directory and whether it was just indexed
+
+        """
+
+        now = time.time()
+
+        with self._lock:
+            entry = self._directories.get(path)
+
+            if entry is not None:
+                # Move to the end, making it most recently used
+                del self._directories[path]
+                self._directories[path] = entry
+
+                if now - entry.checked < ttl:
+                    return entry, False
+
+        mtime = ListingCache.mtime(path)
+
+        if entry is not None and entry.mtime == mtime:
+            with self._lock:
+                entry.checked = now
+            return entry, False
+
+        if entry is not None:
+            stamps, values = self._index(path, entry.stamps, entry.values,
+                                         basenames)
+        else:
+            stamps, values = self._index(path, dict(), dict(), basenames)
+
+        entry = _Directory(mtime, now, stamps, values)
+
+        with self._lock:
+            self.misses += 1
+            self._directories.pop(path, None)
+            self._directories[path] = entry
+
+            while len(self._directories) > self.size:
+                self._directories.popitem(last=False)
+
+        return entry, True
+
+    def _validate(self, path, entry, basenames):
+        """Re-read those of `basenames` whose ``.meta`` has changed
+
+        Returns:
+            bool: True if nothing had changed
+
+        """
+
+        stamps = entry.stamps
+        changed = dict()
+
+        for basename in basenames:
+            if basename not in stamps:
+                continue
+
+            child = os.path.join(path, basename)
+            mtime = ListingCache.mtime(os.path.join(child, '.meta'))
+
+            if mtime != stamps[basename]:
+                values = dict()
+                self._read(child, basename, values)
+                changed[basename] = (mtime, values.get(basename))
+
+        with self._lock:
+            if not changed:
+                self.hits += 1
+                return True
+
+            self.misses += 1
+            stamps = dict(entry.stamps)
+            values = dict(entry.values)
+
+            for basename, (mtime, value) in changed.items():
+                stamps[basename] = mtime
+
+                if value is None:
+                    values.pop(basename, None)
+                else:
+                    values[basename] = value
+
+            entry.stamps = stamps
+            entry.values = values
+
+        return False
+
+    def _index(self, path, stamps, values, basenames=None):
+        """Index metadata of every child of `path` in one pass"""
+        if basenames is None:
+            dash.trace.count('listdir')
+
+            try:
+                basenames = os.listdir(path)
+            except OSError:
+                return dict(), dict()
+
+        fresh_stamps = dict()
+        fresh_values = dict()
+
+        for basename in basenames:
+            if basename.startswith('.'):
+                continue
+
+            child = os.path.join(path, basename)
+            mtime = ListingCache.mtime(os.path.join(child, '.meta'))
+            fresh_stamps[basename] = mtime
+
+            if mtime is None:
+                continue
+
+            # Reuse what is still valid from a previous index
+            if stamps.get(basename) == mtime and basename in values:
+                fresh_values[basename] = values[basename]
+                continue
+
+            self._read(child, basename, fresh_values)
+
+        return fresh_stamps, fresh_values
+
+    def _read(self, path, basename, values):
+        """Read keys present in ``.meta`` of `path` into `values`"""
+        values.pop(basename, None)
+        dash.trace.count('listdir')
+
+        try:
+            present = os.listdir(os.path.join(path, '.meta'))
+        except OSError:
+            return
+
+        result = dict()
+        for name in present:
+            for key in self.keys:
+                if name == key or name.split('.', 1)[0] == key:
+                    dash.trace.count('metadata')
+                    result[key] = pifou.metadata.read(path, name)
+
+        if result:
+            values[basename] = result
+
+
+class JunctionResolver(object):
+    """Memoized targets of junctions, following chains of junctions
+
+    A junction forwards a directory to another, relative to itself.
+    Chains are followed up to `depth` junctions; chains longer than
+    that, or leading back onto themselves, are reported and not
+    followed at all.
+
+    Each target is validated by the modification time of ``.meta``
+    of every directory along its chain, such that a lookup costs a
+    ``stat`` per junction followed.
+
+    Safe to use from multiple threads.
+
+    Arguments:
+        metadata (MetadataIndex): Index from which to read junctions
+        depth (int): Maximum number of junctions followed
+        size (int): Maximum number of paths to keep
+
+    """
+
+    def __init__(self, metadata, depth=8, size=4096):
+        self.metadata = metadata
+        self.depth = depth
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+
+        # Path -> (((.meta, mtime), ...), target)
+        self._targets = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def target(self, path):
+        """Return directory `path` forwards to, or `path` itself
+
+        Arguments:
+            path (str): Absolute path to directory
+
+        """
+
+        with self._lock:
+            entry = self._targets.get(path)
+
+        if entry is not None and all(ListingCache.mtime(meta) == mtime
+                                     for meta, mtime in entry[0]):
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+
+        stamps, target = self._follow(path)
+
+        with self._lock:
+            self.misses += 1
+            self._targets.pop(path, None)
+            self._targets[path] = (stamps, target)
+
+            while len(self._targets) > self.size:
+                self._targets.popitem(last=False)
+
+        return target
+
+    def _follow(self, path):
+        stamps = list()
+        visited = [path]
+        current = path
+
+        while True:
+            meta = os.path.join(current, '.meta')
+            mtime = ListingCache.mtime(meta)
+            stamps.append((meta, mtime))
+
+            junction = None
+            if mtime is not None:
+                junction = self.metadata.read(current, JUNCTION)
+
+            if not junction:
+                return tuple(stamps), current
+
+            following = os.path.normpath(os.path.join(current, junction))
+
+            if following in visited:
+                log.warning("Junction of %s leads back onto %s, "
+                            "not following" % (path, following))
+                return tuple(stamps), path
+
+            if len(visited) > self.depth:
+                log.warning("Junction of %s exceeds %i junctions, "
+                            "not following" % (path, self.depth))
+                return tuple(stamps), path
+
+            visited.append(following)
+            current = following
+
+    def invalidate(self, path=None):
+        """Forget target of `path`, or of every path"""
+        with self._lock:
+            if path is None:
+                self._targets.clear()
+            else:
+                self._targets.pop(path, None)
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'size': len(self._targets),
+                    'capacity': self.size}
+
+
+metadata = MetadataIndex(ttl=dash.settings.METADATA_TTL)
+junctions = JunctionResolver(metadata, depth=dash.settings.JUNCTION_DEPTH)
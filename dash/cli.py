@@ -0,0 +1,401 @@
+"""Command-line interface to resolving and launching workspaces
+
+Resolves many workspaces at once, in parallel, and prints the
+result as JSON; no GUI is involved.
+
+Resolution may be served by a long-lived daemon, keeping plans and
+inherited metadata warm in between calls. Commands are sent to it
+as a single line of JSON over a local socket, and answered likewise.
+
+As the socket is reachable by every user of the host, each command
+carries a token only readable by the user running the daemon, see
+:data:`dash.settings.DAEMON_TOKEN`; commands without it are refused.
+
+Usage:
+    $ python -m dash resolve /projects/job/seq/shot/maya
+    $ python -m dash launch /projects/job/seq/shot/maya --wait
+    $ python -m dash daemon &
+    $ python -m dash resolve --daemon /projects/job/*/*/maya
+
+"""
+
+# standard library
+import os
+import sys
+import hmac
+import json
+import errno
+import binascii
+import socket
+import logging
+import argparse
+import threading
+import subprocess
+from multiprocessing.pool import ThreadPool
+
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+# local library
+import dash
+import dash.plan
+import dash.inherit
+import dash.settings
+
+log = logging.getLogger('dash.cli')
+
+HOST = '127.0.0.1'
+WORKERS = 8  # Workspaces resolved concurrently
+
+
+class DaemonError(Exception):
+    """Daemon could not be reached, or failed to respond"""
+
+
+def describe(path, plan):
+    """Return JSON-compatible description of `plan` for `path`"""
+    if plan is None:
+        return {'path': path,
+                'error': "Application '%s' could not be found"
+                         % dash.plan.application_from_path(path)}
+
+    return {'path': path,
+            'application': plan.application,
+            'executable': plan.executable,
+            'argv': plan.argv,
+            'env': plan.environment}
+
+
+def plans_of(plans, paths, workers=WORKERS):
+    """Return plan per path of `paths`, resolved in parallel
+
+    Arguments:
+        plans (dash.plan.PlanCache): Cache to resolve through
+        paths (list): Absolute paths to workspaces
+        workers (int): Number of concurrent resolutions
+
+    Returns:
+        list: Plan, None if unresolvable, or the exception raised
+            whilst resolving, per path.
+
+    """
+
+    def _resolve(path):
+        try:
+            return plans.get(path)
+        except Exception as e:
+            return e
+
+    if len(paths) < 2 or workers < 2:
+        return [_resolve(path) for path in paths]
+
+    pool = ThreadPool(min(workers, len(paths)))
+
+    try:
+        return pool.map(_resolve, paths)
+    finally:
+        pool.close()
+
+
+def _describe(path, plan):
+    if isinstance(plan, Exception):
+        return {'path': path, 'error': str(plan)}
+
+    return describe(path, plan)
+
+
+def resolve(plans, paths, workers=WORKERS):
+    """Resolve `paths` in parallel, preserving their order
+
+    Arguments:
+        plans (dash.plan.PlanCache): Cache to resolve through
+        paths (list): Absolute paths to workspaces
+        workers (int): Number of concurrent resolutions
+
+    Returns:
+        list: Description per path, see :func:`describe`
+
+    """
+
+    return [_describe(path, plan)
+            for path, plan in zip(paths, plans_of(plans, paths, workers))]
+
+
+def launch(plans, paths, workers=WORKERS, wait=False):
+    """Resolve and launch `paths`
+
+    Arguments:
+        plans (dash.plan.PlanCache): Cache to resolve through
+        paths (list): Absolute paths to workspaces
+        workers (int): Number of concurrent resolutions
+        wait (bool): Wait for every process to exit
+
+    Returns:
+        list: Description per path, along with "pid" and,
+            if waited for, "returncode".
+
+    """
+
+    results = list()
+    processes = list()
+
+    for path, plan in zip(paths, plans_of(plans, paths, workers)):
+        result = _describe(path, plan)
+        results.append(result)
+
+        if 'error' in result:
+            continue
+
+        try:
+            process = subprocess.Popen(plan.argv, env=plan.env())
+        except OSError as e:
+            result['error'] = "Could not launch: %s" % e
+            continue
+
+        result['pid'] = process.pid
+        processes.append((result, process))
+
+    if wait:
+        for result, process in processes:
+            result['returncode'] = process.wait()
+
+    return results
+
+
+def create_token(path):
+    """Write a fresh token to `path`, readable by the current user only
+
+    Returns:
+        str: The token
+
+    """
+
+    directory = os.path.dirname(path)
+
+    try:
+        os.makedirs(directory, 0o700)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+    token = binascii.hexlify(os.urandom(32)).decode('ascii')
+
+    # Removed first, such that the file is never created
+    # with, or left at, permissions of somebody else's choosing.
+    if os.path.exists(path):
+        os.remove(path)
+
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        f.write(token)
+
+    return token
+
+
+def read_token(path):
+    """Return token of running daemon, see :func:`create_token`
+
+    Raises:
+        DaemonError: If there is no token, i.e. no daemon running
+
+    """
+
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except IOError as e:
+        raise DaemonError("No daemon running, %s: %s" % (path, e))
+
+
+class Daemon(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    """Serve resolution and launching over a local socket
+
+    Plans and inherited metadata are cached for the lifetime of
+    the daemon. Processes it launches inherit its environment.
+
+    Only requests carrying the token written to `token` upon
+    creation are served, such that other users of the host cannot
+    launch processes as the user running the daemon.
+
+    Arguments:
+        port (int): Port to listen on, on the local host
+        workers (int): Number of concurrent resolutions per request
+        token (str): Path to which to write the token
+
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=dash.DEFAULT_PORT, workers=WORKERS,
+                 token=dash.settings.DAEMON_TOKEN):
+        socketserver.TCPServer.__init__(self, (HOST, port), Handler)
+        self.plans = dash.plan.PlanCache()
+        self.workers = workers
+        self.token_path = token
+        self.token = create_token(token)
+
+    def server_close(self):
+        socketserver.TCPServer.server_close(self)
+
+        try:
+            os.remove(self.token_path)
+        except OSError:
+            pass
+
+    def handle_request_data(self, request):
+        """Return response to `request`
+
+        Arguments:
+            request (dict): Command and its arguments, e.g.
+                {"command": "resolve", "paths": [...], "token": "..."}
+
+        """
+
+        token = request.get('token')
+        if not (isinstance(token, type(self.token)) and
+                hmac.compare_digest(token, self.token)):
+            return {'error': "Unauthorised"}
+
+        command = request.get('command')
+        paths = request.get('paths', list())
+
+        if command == 'resolve':
+            return {'results': resolve(self.plans, paths, self.workers)}
+
+        if command == 'launch':
+            return {'results': launch(self.plans, paths, self.workers)}
+
+        if command == 'stats':
+            return {'plans': self.plans.stats(),
+                    'inherit': dash.inherit.resolver.stats()}
+
+        if command == 'stop':
+            # Shutdown waits for serve_forever, running in another thread
+            threading.Thread(target=self.shutdown).start()
+            return {'stopped': True}
+
+        return {'error': "Unknown command: %r" % command}
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        line = self.rfile.readline()
+
+        try:
+            response = self.server.handle_request_data(
+                json.loads(line.decode('utf-8')))
+        except Exception as e:
+            log.exception("Request failed")
+            response = {'error': str(e)}
+
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+
+def request(command, paths=None, port=dash.DEFAULT_PORT, timeout=60,
+            token=dash.settings.DAEMON_TOKEN):
+    """Send `command` to a running daemon and return its response
+
+    Raises:
+        DaemonError: If the daemon could not be reached
+
+    """
+
+    data = json.dumps({'command': command,
+                       'paths': paths or list(),
+                       'token': read_token(token)})
+
+    try:
+        connection = socket.create_connection((HOST, port), timeout)
+    except socket.error as e:
+        raise DaemonError("No daemon on port %s: %s" % (port, e))
+
+    try:
+        connection.sendall((data + '\n').encode('utf-8'))
+        stream = connection.makefile('rb')
+        line = stream.readline()
+        stream.close()
+    finally:
+        connection.close()
+
+    if not line:
+        raise DaemonError("Daemon closed connection without responding")
+
+    return json.loads(line.decode('utf-8'))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m dash')
+    parser.add_argument('--port', type=int, default=dash.DEFAULT_PORT)
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help="Workspaces resolved concurrently")
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    for command, description in (('resolve', "Print argv and environment"),
+                                 ('launch', "Launch workspaces")):
+        subparser = subparsers.add_parser(command, help=description)
+        subparser.add_argument('paths', nargs='+',
+                               help="Absolute paths to workspaces")
+        subparser.add_argument('--daemon', action='store_true',
+                               help="Send to a running daemon")
+
+        if command == 'launch':
+            subparser.add_argument('--wait', action='store_true',
+                                   help="Wait for launched processes")
+
+    subparsers.add_parser('daemon', help="Serve on a local socket")
+    subparsers.add_parser('stats', help="Print cache statistics of daemon")
+    subparsers.add_parser('stop', help="Stop a running daemon")
+
+    args = parser.parse_args(argv)
+
+    if args.command is None:
+        parser.print_help()
+        return 1
+
+    if args.command == 'daemon':
+        server = Daemon(args.port, args.workers)
+        log.info("Serving on %s:%s" % (HOST, args.port))
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+        return 0
+
+    try:
+        if args.command in ('stats', 'stop'):
+            response = request(args.command, port=args.port)
+
+        elif args.daemon:
+            if args.command == 'launch' and args.wait:
+                parser.error("--wait is unsupported with --daemon")
+
+            response = request(args.command, args.paths, args.port)
+            response = response.get('results', response)
+
+        elif args.command == 'resolve':
+            response = resolve(dash.plan.PlanCache(),
+                               args.paths, args.workers)
+
+        else:
+            response = launch(dash.plan.PlanCache(),
+                              args.paths, args.workers, args.wait)
+
+    except DaemonError as e:
+        sys.stderr.write("%s\n" % e)
+        return 1
+
+    sys.stdout.write(json.dumps(response, indent=2, sort_keys=True) + '\n')
+
+    failed = isinstance(response, list) and any(
+        'error' in result or result.get('returncode')
+        for result in response)
+
+    return 1 if failed else 0
@@ -10,6 +10,9 @@ Usage:
 
 from __future__ import absolute_import
 
+# standard library
+import os
+
 # pifou library
 import pifou.lib
 
@@ -27,11 +30,28 @@ from PyQt5 import QtWidgets
 
 # local library
 import dash.view
-import dash.model
+import dash.event
+import dash.inherit
 import dash.settings
 
-pigui.style.register('dash')
-dash.view.monkey_patch()
+_setup = False
+
+
+def setup():
+    """Register style and delegates of Dash, once
+
+    Deferred until the first window is created, such that importing
+    this module is free of side-effects.
+
+    """
+
+    global _setup
+    if _setup:
+        return
+
+    pigui.style.register('dash')
+    dash.view.monkey_patch()
+    _setup = True
 
 
 @pifou.lib.log
@@ -40,10 +60,21 @@ class Dash(pigui.pyqt5.widgets.application.widget.ApplicationBase):
 
     Signals:
         launch (str): Emits plain-path of workspace to launch.
+        quick_launch (str): Emits absolute path of workspace to launch,
+            as chosen from the quick-launch palette.
+        launch_started (str, int): Workspace and pid of launched process
+        launch_finished (str, int): Workspace and exit code of process
+        launch_failed (str, str): Workspace and reason launch failed
 
     """
 
     launch = QtCore.pyqtSignal(str)  # index
+    quick_launch = QtCore.pyqtSignal(str)  # path
+
+    # Emitted from the threads of dash.launcher.Launcher
+    launch_started = QtCore.pyqtSignal(str, int)
+    launch_finished = QtCore.pyqtSignal(str, int)
+    launch_failed = QtCore.pyqtSignal(str, str)
 
     def __init__(self, parent=None):
         """
@@ -52,6 +83,8 @@ class Dash(pigui.pyqt5.widgets.application.widget.ApplicationBase):
 
         """
 
+        setup()
+
         super(Dash, self).__init__(parent)
         self.setWindowTitle("Dash")
 
@@ -77,8 +110,16 @@ class Dash(pigui.pyqt5.widgets.application.widget.ApplicationBase):
 
         self.set_widget(widget)
 
+        shortcut = QtWidgets.QShortcut(QtGui.QKeySequence('Ctrl+P'), self)
+        shortcut.activated.connect(self.quick_launch_palette)
+
+        self.launch_started.connect(self.launch_started_event)
+        self.launch_finished.connect(self.launch_finished_event)
+        self.launch_failed.connect(self.launch_failed_event)
+
         self.view = view
         self.model = None
+        self.palette = None
 
     def set_model(self, model):
         """Set model for this controller
@@ -93,122 +134,128 @@ class Dash(pigui.pyqt5.widgets.application.widget.ApplicationBase):
         model.status.connect(self.status_event)
 
     def event(self, event):
-        """Event handlers
+        """Route events to handlers registered via :func:`dash.event.handles`
 
         Handled events:
             AddItemEvent -- A workspace is being added
             CommandEvent -- A command is being executed
+            EditItemEvent -- An item is being renamed
+            ItemRenamedEvent -- An item has been renamed
             OpenInExplorerEvent -- An item is being explored
             OpenInAboutEvent -- An item is being explored, in About
+            HoverEvent -- An item is likely to be opened next
 
         """
 
-        def add_item(index):
-            """Footer has been pressed
-
-            Arguments:
-                index (str): Index of footer which was pressed
-
-            """
-
-            if self.model.data(index, 'type') == pigui.pyqt5.model.Footer:
-                index = self.model.item(index).parent.index
-
-            if self.model.data(index, 'type') == 'workspace':
-                # Workspaces only list commands. Clicking the
-                # footer within this list shouldn't do anything.
-                # TODO: Remove footer from command-lists.
-                return
-
-            self.add_workspace_menu(index)
-
-        def command(index):
-            """A command delegate was pressed
-
-            Arguments:
-                index (str): Index of command
-
-            """
-
-            command = self.model.data(event.index, 'command')
-
-            if command == 'launch':
-                path = self.model.data(event.index, 'path')
-                message = path + "\n\n" + "Launch?"
-                self.launch.emit(event.index)
-                self.notify("Launching {}".format(path))
-                # if self.confirm(message):
-
-            if command == 'configure':
-                path = self.model.data(event.index, 'path')
-                pigui.service.open_in_about(path)
-                self.notify('Configuring')
-
-            if command == 'remove':
-                path = self.model.data(event.index, 'path')
-                message = path + "\n\n" + "Remove?"
-                if self.confirm(message):
-                    self.model.remove_workspace(event.index)
-
-        def rename(index):
-            label = self.model.data(index=event.index, key='display')
-            edited = event.view.indexes[event.index]
-            editor = pigui.pyqt5.widgets.delegate.RenamerDelegate(
-                label,
-                index=event.index,
-                parent=edited)
+        dash.event.dispatch(self, event)
+        return super(Dash, self).event(event)
 
-            # Overlap edited
-            editor.resize(edited.size())
-            editor.show()
+    @dash.event.handles(pigui.pyqt5.event.Type.AddItemEvent)
+    def add_item_event(self, event):
+        """Footer has been pressed"""
+        index = event.index
 
-        def renamed(index):
-            name = event.data
-            self.model.set_data(index=event.index,
-                                key=pigui.pyqt5.model.Display,
-                                value=name)
+        if self.model.data(index, 'type') == pigui.pyqt5.model.Footer:
+            index = self.model.item(index).parent.index
 
-        def open_explorer(index):
-            """Open `index` in file-system explorer
+        if self.model.data(index, 'type') == 'workspace':
+            # Workspaces only list commands. Clicking the
+            # footer within this list shouldn't do anything.
+            # TODO: Remove footer from command-lists.
+            return
 
-            Arguments:
-                index (str): Index to open
+        self.add_workspace_menu(index)
 
-            """
+    @dash.event.handles(dash.event.Type.CommandEvent)
+    def command_event(self, event):
+        """A command delegate was pressed"""
+        command = self.model.data(event.index, 'command')
 
+        if command == 'launch':
             path = self.model.data(event.index, 'path')
-            pigui.service.open_in_explorer(path)
-
-        def open_about(index):
-            """Open `index` in About
-
-            Arguments:
-                index (str): Index to open
-
-            """
+            message = path + "\n\n" + "Launch?"
+            self.launch.emit(event.index)
+            self.notify("Launching {}".format(path))
+            # if self.confirm(message):
 
+        if command == 'configure':
             path = self.model.data(event.index, 'path')
             pigui.service.open_in_about(path)
+            self.notify('Configuring')
 
-        # Handled events
-        AddItemEvent = pigui.pyqt5.event.Type.AddItemEvent
-        CommandEvent = dash.event.Type.CommandEvent
-        OpenInExplorerEvent = dash.event.Type.OpenInExplorerEvent
-        OpenInAboutEvent = dash.event.Type.OpenInAboutEvent
-        EditItemEvent = pigui.pyqt5.event.Type.EditItemEvent
-        ItemRenamedEvent = pigui.pyqt5.event.Type.ItemRenamedEvent
-
-        handler = {AddItemEvent: add_item,
-                   CommandEvent: command,
-                   OpenInExplorerEvent: open_explorer,
-                   OpenInAboutEvent: open_about,
-                   EditItemEvent: rename,
-                   ItemRenamedEvent: renamed}.get(event.type())
-
-        if handler:
-            handler(event.index)
-
-        return super(Dash, self).event(event)
+        if command == 'remove':
+            path = self.model.data(event.index, 'path')
+            message = path + "\n\n" + "Remove?"
+            if self.confirm(message):
+                self.model.remove_workspace(event.index)
+
+    @dash.event.handles(pigui.pyqt5.event.Type.EditItemEvent)
+    def rename_event(self, event):
+        label = self.model.data(index=event.index, key='display')
+        edited = event.view.indexes[event.index]
+        editor = pigui.pyqt5.widgets.delegate.RenamerDelegate(
+            label,
+            index=event.index,
+            parent=edited)
+
+        # Overlap edited
+        editor.resize(edited.size())
+        editor.show()
+
+    @dash.event.handles(pigui.pyqt5.event.Type.ItemRenamedEvent)
+    def renamed_event(self, event):
+        name = event.data
+        self.model.set_data(index=event.index,
+                            key=pigui.pyqt5.model.Display,
+                            value=name)
+
+    @dash.event.handles(dash.event.Type.OpenInExplorerEvent)
+    def open_in_explorer_event(self, event):
+        """Open item in file-system explorer"""
+        path = self.model.data(event.index, 'path')
+        pigui.service.open_in_explorer(path)
+
+    @dash.event.handles(dash.event.Type.OpenInAboutEvent)
+    def open_in_about_event(self, event):
+        """Open item in About"""
+        path = self.model.data(event.index, 'path')
+        pigui.service.open_in_about(path)
+
+    @dash.event.handles(dash.event.Type.HoverEvent)
+    def hover_event(self, event):
+        """Read item under the mouse ahead of it being opened"""
+        self.model.prefetch(event.index)
+
+    def quick_launch_palette(self):
+        """Open palette with which to search for and launch workspaces"""
+        if self.model is None:
+            return
+
+        if self.palette is None:
+            import dash.palette
+            self.palette = dash.palette.QuickLaunch(self.model.search, self)
+            self.palette.launch.connect(self.quick_launch_event)
+
+        width, height = self.width(), self.height()
+        self.palette.resize(int(width * 0.8), int(height * 0.6))
+        self.palette.move(self.mapToGlobal(
+            QtCore.QPoint(int(width * 0.1), 0)))
+        self.palette.show()
+
+    def quick_launch_event(self, path):
+        self.quick_launch.emit(path)
+        self.notify("Launching {}".format(path))
+
+    def launch_started_event(self, path, pid):
+        self.notify("Started {} ({})".format(os.path.basename(path), pid))
+
+    def launch_finished_event(self, path, returncode):
+        if returncode:
+            self.notify("{} exited with code {}".format(
+                os.path.basename(path), returncode))
+
+    def launch_failed_event(self, path, message):
+        self.notify(message)
 
     def status_event(self, message):
         """Notify user of events from model
@@ -251,14 +298,7 @@ class Dash(pigui.pyqt5.widgets.application.widget.ApplicationBase):
 
         path = self.model.data(index, 'path')
         assert path, self.model.item(index)._data
-        location = pifou.metadata.Location(path)
-        entry = pifou.metadata.Entry('apps', parent=location)
-        pifou.metadata.inherit(entry)
-
-        actions = list()
-        if entry.type in ('list', 'dict'):
-            for app in entry:
-                actions.append(app.path.name)
+        actions = sorted(dash.inherit.resolver.resolve(path))
 
         if not actions:
             actions.append('No apps')
@@ -281,6 +321,8 @@ if __name__ == '__main__':
 
     import pigui.pyqt5.util
 
+    import dash.model
+
     with pigui.pyqt5.util.application_context():
 
         model = dash.model.Model()
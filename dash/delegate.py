@@ -1,12 +1,16 @@
 
 """Dashboard-specific delegates"""
 
+# standard library
+import collections
+
 # pifou library
 import pifou
 import pifou.metadata
 import pifou.signal
 
 # pifou dependencies
+from PyQt5 import QtCore
 from PyQt5 import QtWidgets
 
 # pigui library
@@ -18,30 +22,42 @@ import dash.event
 
 
 class FolderDelegate(pigui.pyqt5.widgets.delegate.FolderDelegate):
-    """Append context-menu"""
+    """Append context-menu
+
+    Attributes:
+        actions (OrderedDict): Event posted per label of the context-menu
+
+    """
+
+    actions = collections.OrderedDict([
+        ("Open in About", dash.event.OpenInAboutEvent),
+        ("Open in Explorer", dash.event.OpenInExplorerEvent),
+        ("Hide", dash.event.HideEvent),
+    ])
 
     def action_event(self, state):
         action = self.sender()
-        label = action.text()
+        event = self.actions.get(action.text())
 
-        if label == "Open in About":
-            event = dash.event.OpenInAboutEvent(index=self.index)
-            QtWidgets.QApplication.postEvent(self, event)
+        if event is not None:
+            QtWidgets.QApplication.postEvent(self, event(index=self.index))
 
-        elif label == "Open in Explorer":
-            event = dash.event.OpenInExplorerEvent(index=self.index)
-            QtWidgets.QApplication.postEvent(self, event)
+    def enterEvent(self, event):
+        """Let the controller know what is likely to be opened next"""
+        super(FolderDelegate, self).enterEvent(event)
+        hover = dash.event.HoverEvent(index=self.index)
+        QtWidgets.QApplication.postEvent(self, hover)
 
-        elif label == "Hide":
-            event = dash.event.HideEvent(index=self.index)
-            QtWidgets.QApplication.postEvent(self, event)
+    def focusInEvent(self, event):
+        """Keyboard navigation is treated like hovering"""
+        super(FolderDelegate, self).focusInEvent(event)
+        hover = dash.event.HoverEvent(index=self.index)
+        QtWidgets.QApplication.postEvent(self, hover)
 
     def contextMenuEvent(self, event):
         menu = QtWidgets.QMenu(self)
 
-        for label in ("Open in About",
-                      "Open in Explorer",
-                      "Hide"):
+        for label in self.actions:
             action = QtWidgets.QAction(label,
                                        self,
                                        triggered=self.action_event)
@@ -50,6 +66,30 @@ class FolderDelegate(pigui.pyqt5.widgets.delegate.FolderDelegate):
         menu.exec_(event.globalPos())
 
 
+class LoadingIndicator(QtCore.QObject):
+    """Clear the `loading` property of `parent` once `index` is loaded
+
+    Parented to the delegate such that it is destroyed, and
+    disconnected, along with it.
+
+    """
+
+    def __init__(self, index, parent):
+        super(LoadingIndicator, self).__init__(parent)
+        self.index = index
+
+    def loaded_event(self, index):
+        if index != self.index:
+            return
+
+        delegate = self.parent()
+        delegate.setProperty('loading', False)
+
+        # Re-apply stylesheet to reflect new property
+        delegate.style().unpolish(delegate)
+        delegate.style().polish(delegate)
+
+
 class FileDelegate(pigui.pyqt5.widgets.delegate.FileDelegate):
     pass
 
@@ -1,6 +1,38 @@
 
+"""Events of Dash, and their routing to handlers
+
+Handlers are methods registered for one or more event types via
+:func:`handles`. The routing table of a class is built once, upon
+its first event, after which :func:`dispatch` is a single lookup;
+events without a handler are left to the base class.
+
+With instrumentation enabled, see :mod:`dash.trace`, every event is
+counted per type and time spent in handlers is recorded per type.
+
+Example:
+    >>> class Window(QtWidgets.QWidget):
+    ...     @handles(Type.HoverEvent)
+    ...     def hover_event(self, event):
+    ...         print(event.index)
+    ...
+    ...     def event(self, event):
+    ...         dispatch(self, event)
+    ...         return super(Window, self).event(event)
+
+"""
+
+# pigui library
 from pigui.pyqt5.event import BaseEvent, ItemEvent, Type
 
+# pigui dependency
+from PyQt5 import QtCore
+
+# local library
+import dash.trace
+
+# Event type -> name, built upon first use, see describe()
+_names = dict()
+
 
 # class PathEvent(BaseEvent):
 #     def __init__(self, path):
@@ -28,6 +60,83 @@ class CommandEvent(ItemEvent):
     pass
 
 
+@Type.register
+class HoverEvent(ItemEvent):
+    pass
+
+
 @Type.register
 class TrayActivatedEvent(BaseEvent):
     pass
+
+
+def handles(*types):
+    """Register decorated method as handler of events of `types`"""
+    def decorator(func):
+        func.handles = types
+        return func
+    return decorator
+
+
+def routes(cls):
+    """Return name of handler per event type of `cls`
+
+    Built once per class, including handlers inherited from bases;
+    those of subclasses take precedence.
+
+    """
+
+    table = cls.__dict__.get('_routes')
+
+    if table is None:
+        table = dict()
+
+        for base in reversed(cls.__mro__):
+            for name, member in vars(base).items():
+                for kind in getattr(member, 'handles', ()):
+                    table[kind] = name
+
+        cls._routes = table
+
+    return table
+
+
+def dispatch(obj, event):
+    """Pass `event` to its handler on `obj`, if any
+
+    Returns:
+        bool: Whether `event` was handled
+
+    """
+
+    kind = event.type()
+    name = routes(type(obj)).get(kind)
+
+    if dash.trace.enabled:
+        label = 'event.' + describe(kind)
+        dash.trace.count(label)
+
+        if name is None:
+            return False
+
+        with dash.trace.span(label):
+            getattr(obj, name)(event)
+
+        return True
+
+    if name is None:
+        return False
+
+    getattr(obj, name)(event)
+    return True
+
+
+def describe(kind):
+    """Return name of event type `kind`, e.g. Paint or HoverEvent"""
+    if not _names:
+        for container in (QtCore.QEvent, Type):
+            for name, value in vars(container).items():
+                if isinstance(value, int) and not name.startswith('_'):
+                    _names.setdefault(int(value), name)
+
+    return _names.get(int(kind)) or str(int(kind))
@@ -1,18 +1,86 @@
+"""Filters applied to nodes of the content hierarchy
+
+Each operator may be applied to a single node, as a cascading
+:mod:`pifou.filter` operator, or be compiled together with others
+into a :class:`Pipeline` applied to every node of a listing at once.
+
+Listings of the model are filtered by :data:`listing`, see
+:func:`dash.scan.scan`.
+
+"""
+
+# standard library
+import os
+import collections
 
-import pifou.metadata
 import pifou.filter
 
 from pifou.com import source
 
+import dash.cache
+import dash.trace
+import dash.worker
+
+# Operator -> function applied to a batch, see Pipeline
+_stages = dict()
+
+# Operators whose batch-equivalent requires pifou nodes
+_nodes = set()
+
+
+def stage(operator, nodes=False):
+    """Register decorated function as batch-equivalent of `operator`
+
+    Arguments:
+        operator (pifou.filter.Operator): Operator of this module
+        nodes (bool): Whether the function requires pifou nodes,
+            rather than any object, as the second item of each entry.
+
+    """
+
+    def decorator(func):
+        _stages[operator] = func
+        if nodes:
+            _nodes.add(operator)
+        return func
+    return decorator
+
+
+def _metadata(entry):
+    """Return metadata of `entry`, looking it up if unknown"""
+    if entry[2] is None:
+        entry[2] = dash.cache.metadata.node(entry[1].path.as_str)
+    return entry[2]
+
+
+def _target(node):
+    """Return copy of `node` at the target of its junction, or None"""
+    path = node.path.as_str
+    target = dash.cache.junctions.target(path)
+
+    if target == path:
+        return None
+
+    junction_path = node.path + os.path.relpath(target, path)
+    return node.copy(path=junction_path)
+
 
 @pifou.filter.Operator.cascading
+@dash.trace.timed('filter.post_hide_hidden')
 def post_hide_hidden(node):
     """Hide `hidden` elements"""
-    if not pifou.metadata.find(node.path.as_str, 'hidden'):
+    if not dash.cache.metadata.find(node.path.as_str, 'hidden'):
         return node
 
 
+@stage(post_hide_hidden)
+def _hide_hidden(entries):
+    return [entry for entry in entries
+            if dash.cache.HIDDEN not in _metadata(entry)]
+
+
 @pifou.filter.Operator.cascading
+@dash.trace.timed('filter.pre_junction')
 def pre_junction(node):
     """Forward junctions to target `goto`
         _________
@@ -22,21 +90,149 @@ def pre_junction(node):
 
     """
 
-    junction = pifou.metadata.read(node.path.as_str, 'junction')
-
-    if junction:
-        assert isinstance(junction, basestring)
-        junction_path = node.path + junction
-        junction_node = node.copy(path=junction_path)
-
-        source.disk.pull(junction_node)
+    junction_node = _target(node)
 
+    if junction_node is not None:
         node = junction_node
+        source.disk.pull(node)
 
     return node
 
 
+@stage(pre_junction, nodes=True)
+def _junction(entries):
+    """Follow every junction of `entries`, pulling targets concurrently"""
+    targets = list()
+
+    for entry in entries:
+        if dash.cache.JUNCTION not in _metadata(entry):
+            continue
+
+        junction_node = _target(entry[1])
+        if junction_node is not None:
+            entry[1] = junction_node
+            entry[2] = None
+            targets.append(junction_node)
+
+    # Pulled by the shared pool alongside the columns on screen, with
+    # any not yet picked up by the time they are waited for pulled here.
+    pool = dash.worker.io()
+    requests = [pool.request(None, source.disk.pull, (target,),
+                             priority=dash.worker.VISIBLE)
+                for target in targets[1:]]
+
+    for target in targets[:1]:
+        source.disk.pull(target)
+
+    for request in requests:
+        request.task.wait()
+
+    return entries
+
+
 @pifou.filter.Operator.cascading
+@dash.trace.timed('filter.discard_files')
 def discard_files(node):
     if node.isparent:
         return node
+
+
+@stage(discard_files, nodes=True)
+def _discard_files(entries):
+    return [entry for entry in entries if entry[1].isparent]
+
+
+class Pipeline(object):
+    """Chain of operators applied to many nodes at once
+
+    Results, and their order, are identical to applying each operator
+    to each node in turn, except that metadata is looked up once per
+    directory rather than per node and operator, and junctions are
+    followed together.
+
+    Arguments:
+        operators (list): Operators of this module, in order of
+            application.
+
+    Example:
+        >>> pipeline = Pipeline([post_hide_hidden, discard_files])
+        >>> pipeline([])
+        []
+
+    """
+
+    def __init__(self, operators):
+        self.operators = list(operators)
+
+        try:
+            self.stages = [_stages[operator] for operator in operators]
+        except KeyError as e:
+            raise ValueError("%r cannot be part of a pipeline" % e.args[0])
+
+    @dash.trace.timed('filter.pipeline')
+    def __call__(self, nodes):
+        """Return `nodes` that pass every operator, possibly replaced
+
+        Arguments:
+            nodes (list): Nodes, typically the children of a directory
+
+        """
+
+        # Entries are mutable [position, node, metadata]
+        directories = collections.OrderedDict()
+
+        for position, node in enumerate(nodes):
+            path = node.path.as_str.rstrip('/\\')
+            dirname, basename = os.path.split(path)
+            directories.setdefault(dirname, list()).append(
+                [position, node, basename])
+
+        result = list()
+
+        for dirname, entries in directories.items():
+            metadata = dash.cache.metadata.directory(dirname)
+
+            for entry in entries:
+                entry[2] = metadata.get(entry[2], {})
+
+            result.extend(self._apply(entries))
+
+        result.sort(key=lambda entry: entry[0])
+        return [entry[1] for entry in result]
+
+    def names(self, names, metadata):
+        """Return those of `names` that pass every operator
+
+        For listings of a single directory, whose metadata is already
+        known; operators requiring pifou nodes cannot be applied.
+
+        Arguments:
+            names (list): Basenames of children of a directory
+            metadata (dict): {key: value} per basename, as returned
+                by :meth:`dash.cache.MetadataIndex.directory`
+
+        Raises:
+            ValueError: If any operator requires pifou nodes
+
+        """
+
+        for operator in self.operators:
+            if operator in _nodes:
+                raise ValueError("%r requires nodes" % operator)
+
+        entries = [[position, name, metadata.get(name, {})]
+                   for position, name in enumerate(names)]
+
+        return [entry[1] for entry in self._apply(entries)]
+
+    def _apply(self, entries):
+        for func in self.stages:
+            entries = func(entries)
+        return entries
+
+
+# The operators of Dash, in order of application
+pipeline = Pipeline([post_hide_hidden, pre_junction, discard_files])
+
+# The operators applied to every listing of the model
+listing = Pipeline([post_hide_hidden])
@@ -0,0 +1,326 @@
+"""Persistent index of workspaces
+
+Every workspace under the content root is recorded in a local SQLite
+database, along with its application and the modification time of
+its metadata. The index is built by a background
+:class:`Crawler`, kept current by scans made by the model, and
+answers queries across jobs without touching disk.
+
+Example:
+    >>> index = WorkspaceIndex(':memory:')
+    >>> index.find(application='maya', under='/projects/job')
+    []
+
+"""
+
+# standard library
+import os
+import time
+import logging
+import sqlite3
+import threading
+
+# local library
+import dash.scan
+import dash.plan
+import dash.cache
+
+log = logging.getLogger('dash.index')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    mtime REAL
+);
+
+CREATE TABLE IF NOT EXISTS workspaces (
+    path TEXT PRIMARY KEY,
+    parent TEXT,
+    application TEXT,
+    mtime REAL
+);
+
+CREATE INDEX IF NOT EXISTS directories_parent
+    ON directories (parent);
+CREATE INDEX IF NOT EXISTS workspaces_parent
+    ON workspaces (parent);
+CREATE INDEX IF NOT EXISTS workspaces_application
+    ON workspaces (application, path);
+"""
+
+
+def span(path):
+    """Return bounds of paths below `path`, for use in range queries"""
+    prefix = path.rstrip('/\\') + os.sep
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+class WorkspaceIndex(object):
+    """SQLite-backed index of workspaces and the directories above them
+
+    Safe to use from multiple threads.
+
+    Arguments:
+        path (str): Absolute path to database file, created if
+            missing, or ":memory:".
+
+    """
+
+    def __init__(self, path):
+        if path != ':memory:':
+            directory = os.path.dirname(path)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def record(self, path, modified, listing):
+        """Record `listing` of directory `path` as of `modified`
+
+        Children no longer present, and everything below
+        them, are removed from the index.
+
+        Arguments:
+            path (str): Absolute path to directory
+            modified (float): Modification time of `path`
+            listing (list of dash.scan.Entry): Children of `path`
+
+        """
+
+        folders = list()
+        workspaces = list()
+
+        for entry in listing:
+            child = os.path.join(path, entry.name)
+
+            if entry.type == dash.scan.WORKSPACE:
+                workspaces.append((child,
+                                   path,
+                                   dash.plan.application_from_path(child),
+                                   mtime(os.path.join(child, '.meta'))))
+
+            elif entry.group:
+                folders.append(child)
+
+        with self._lock, self._db:
+            cursor = self._db.cursor()
+
+            cursor.execute("INSERT OR REPLACE INTO directories "
+                           "VALUES (?, ?, ?)",
+                           (path, os.path.dirname(path), modified))
+
+            # Forget what is gone
+            current = set(folders)
+            for child, in cursor.execute(
+                    "SELECT path FROM directories WHERE parent = ?",
+                    (path,)).fetchall():
+                if child not in current:
+                    self._remove(cursor, child)
+
+            cursor.execute("DELETE FROM workspaces WHERE parent = ?",
+                           (path,))
+            cursor.executemany("INSERT OR REPLACE INTO workspaces "
+                               "VALUES (?, ?, ?, ?)", workspaces)
+
+            # New directories are recorded without an mtime,
+            # marking them as not yet crawled.
+            cursor.executemany("INSERT OR IGNORE INTO directories "
+                               "VALUES (?, ?, NULL)",
+                               [(child, path) for child in folders])
+
+    def remove(self, path):
+        """Remove directory `path` and everything below it"""
+        with self._lock, self._db:
+            self._remove(self._db.cursor(), path)
+
+    def _remove(self, cursor, path):
+        lower, upper = span(path)
+
+        for table in ('directories', 'workspaces'):
+            cursor.execute("DELETE FROM %s WHERE path = ? OR "
+                           "(path >= ? AND path < ?)" % table,
+                           (path, lower, upper))
+
+    def modified(self, path):
+        """Return recorded modification time of `path`, or None"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT mtime FROM directories WHERE path = ?",
+                (path,)).fetchone()
+
+        return row[0] if row else None
+
+    def directories(self, path):
+        """Return recorded child directories of `path`"""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT path FROM directories WHERE parent = ?",
+                (path,)).fetchall()
+
+        return [row[0] for row in rows]
+
+    def workspaces(self, path):
+        """Return recorded workspaces directly within `path`
+
+        Returns:
+            list of (path, application)
+
+        """
+
+        with self._lock:
+            return self._db.execute(
+                "SELECT path, application FROM workspaces "
+                "WHERE parent = ? ORDER BY path",
+                (path,)).fetchall()
+
+    def find(self, application=None, under=None):
+        """Return paths of workspaces matching `application` and `under`
+
+        Arguments:
+            application (str, optional): E.g. "maya"
+            under (str, optional): Absolute path, e.g. to a job
+
+        """
+
+        query = "SELECT path FROM workspaces"
+        clauses = list()
+        arguments = list()
+
+        if application is not None:
+            clauses.append("application = ?")
+            arguments.append(application)
+
+        if under is not None:
+            clauses.append("path >= ? AND path < ?")
+            arguments.extend(span(under))
+
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+
+        query += " ORDER BY path"
+
+        with self._lock:
+            rows = self._db.execute(query, arguments).fetchall()
+
+        return [row[0] for row in rows]
+
+    def since(self, table, rowid):
+        """Return (rowid, path) of rows of `table` added after `rowid`
+
+        Arguments:
+            table (str): "directories" or "workspaces"
+            rowid (int): Last rowid seen, 0 for every row
+
+        """
+
+        assert table in ('directories', 'workspaces'), table
+
+        with self._lock:
+            return self._db.execute(
+                "SELECT rowid, path FROM %s WHERE rowid > ? "
+                "ORDER BY rowid" % table, (rowid,)).fetchall()
+
+    def count(self):
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM workspaces").fetchone()[0]
+
+
+class Crawler(object):
+    """Keep `index` current with everything under `root`
+
+    Each pass visits every recorded directory but only scans those
+    whose modification time differs from that recorded, such that
+    passes after the first cost a ``stat`` per directory.
+
+    Metadata is read through an index of its own, rather than the
+    one shared across Dash, such that a pass doesn't evict the
+    directories the user has open.
+
+    Arguments:
+        index (WorkspaceIndex): Index to keep current
+        root (str): Absolute path to content root
+        interval (float): Seconds between passes, 0 for a single pass
+
+    """
+
+    def __init__(self, index, root, interval=300):
+        self.index = index
+        self.root = root
+        self.interval = interval
+
+        # Each directory is visited once per pass
+        self.metadata = dash.cache.MetadataIndex(size=1)
+
+        self.passes = 0
+        self.scanned = 0
+
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def crawl(self):
+        """Make a single pass over everything under :attr:`root`"""
+        stack = [self.root]
+
+        while stack and not self._stopped.is_set():
+            path = stack.pop()
+            modified = mtime(path)
+
+            if modified is None:
+                self.index.remove(path)
+                continue
+
+            if modified != self.index.modified(path):
+                try:
+                    listing = dash.scan.scan(path, self.metadata)
+                except OSError as e:
+                    log.debug("Skipping %s: %s" % (path, e))
+                    continue
+
+                self.index.record(path, modified, listing)
+                self.scanned += 1
+
+            stack.extend(self.index.directories(path))
+
+        self.passes += 1
+
+    def _run(self):
+        while not self._stopped.is_set():
+            started = time.time()
+
+            try:
+                self.crawl()
+            except Exception:
+                log.exception("Crawling of %s failed" % self.root)
+
+            log.info("Crawled %s in %.2fs" % (self.root,
+                                              time.time() - started))
+
+            if not self.interval or self._stopped.wait(self.interval):
+                break
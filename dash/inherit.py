@@ -0,0 +1,302 @@
+"""Inheritance of application metadata
+
+Metadata of applications, stored under ``apps`` within ``.meta``,
+is inherited down the hierarchy; a "maya" workspace gets the
+arguments, keyword arguments and environment of ``apps/maya`` at
+every level above it, lower levels taking precedence.
+
+Each directory is resolved once, by merging what it defines onto
+the resolved result of its parent. Every workspace of a sequence
+thus shares the resolution of the job and sequence above it, and
+reading a level is only repeated once its ``.meta``, or any group or
+value within ``apps``, has changed.
+
+Entries keep the order in which they are listed on disk, those
+defined at a level preceding those inherited from above it.
+
+Example:
+    >>> resolver = Resolver()
+    >>> resolver.environment('/projects/job/seq/shot/maya', 'maya')
+    {'MAYA_PROJECT': '$workspace'}
+
+Attributes:
+    resolver (Resolver): Resolver shared by launching and the controller
+
+"""
+
+# standard library
+import os
+import threading
+import collections
+
+# pifou library
+import pifou.metadata
+
+# local library
+import dash.trace
+
+APPS = 'apps'
+ARGS = 'args'
+KWARGS = 'kwargs'
+ENVIRONMENT = 'environment'
+
+# Resolved result above root, shared such that root can be validated
+_root = dict()
+
+
+def name(basename):
+    """Return name of value `basename`, without its type suffix
+
+    Example:
+        >>> name('file.ma.string')
+        'file.ma'
+
+    """
+
+    return basename.rsplit('.', 1)[0]
+
+
+def mtime(path):
+    dash.trace.count('stat')
+
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def ancestors(path):
+    """Return `path` and each of its parents, starting at root"""
+    path = os.path.abspath(path)
+    chain = [path]
+
+    while True:
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+
+        chain.append(parent)
+        path = parent
+
+    chain.reverse()
+    return chain
+
+
+def merge(parent, child):
+    """Return `child` merged onto `parent`, modifying neither
+
+    Keys of `child` come first, followed by those only in `parent`.
+
+    """
+
+    result = collections.OrderedDict()
+
+    for key, value in child.items():
+        inherited = parent.get(key)
+        if isinstance(value, dict) and isinstance(inherited, dict):
+            value = merge(inherited, value)
+        result[key] = value
+
+    for key, value in parent.items():
+        if key not in result:
+            result[key] = value
+
+    return result
+
+
+def read(path):
+    """Read ``apps`` defined at `path` itself, without inheritance
+
+    Returns:
+        tuple: Nested dictionary of entries along with the stamp
+            it was read at; the modification time of ``.meta`` and
+            each group and value within ``apps``.
+
+    """
+
+    meta = os.path.join(path, '.meta')
+    stamp = [(meta, mtime(meta))]
+
+    if stamp[0][1] is None:
+        return dict(), tuple(stamp)
+
+    def group(directory, metapath):
+        entries = collections.OrderedDict()
+        stamp.append((directory, mtime(directory)))
+        dash.trace.count('listdir')
+
+        try:
+            basenames = os.listdir(directory)
+        except OSError:
+            return entries
+
+        for basename in basenames:
+            child = os.path.join(directory, basename)
+            childpath = metapath + '/' + basename
+
+            if os.path.isdir(child):
+                entries[basename] = group(child, childpath)
+            else:
+                # Values may be edited in place, leaving
+                # the modification time of `directory` as-is.
+                stamp.append((child, mtime(child)))
+                dash.trace.count('metadata')
+                entries[name(basename)] = pifou.metadata.read(path,
+                                                              childpath)
+
+        return entries
+
+    dash.trace.count('listdir')
+
+    try:
+        basenames = os.listdir(meta)
+    except OSError:
+        basenames = list()
+
+    tree = dict()
+    for basename in basenames:
+        directory = os.path.join(meta, basename)
+        if basename == APPS and os.path.isdir(directory):
+            tree = group(directory, basename)
+            break
+
+    return tree, tuple(stamp)
+
+
+def valid(stamp):
+    return all(mtime(path) == modified for path, modified in stamp)
+
+
+class Resolver(object):
+    """Memoized, inherited ``apps`` of each directory
+
+    Levels are validated by :func:`valid` on every lookup, costing
+    a ``stat`` per level without metadata and one per group and
+    value for levels with metadata.
+
+    Safe to use from multiple threads.
+
+    Arguments:
+        size (int): Maximum number of directories to keep
+
+    Attributes:
+        hits (int): Number of levels reused
+        misses (int): Number of levels read from disk
+
+    """
+
+    def __init__(self, size=2048):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+
+        # Path -> (stamp, tree, parent resolved, resolved)
+        self._levels = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, path):
+        """Return ``apps`` of `path`, as inherited from its parents
+
+        The result is shared, and must not be modified.
+
+        Arguments:
+            path (str): Absolute path to directory
+
+        """
+
+        resolved = _root
+
+        for level in ancestors(path):
+            with self._lock:
+                entry = self._levels.get(level)
+
+            if entry is not None and valid(entry[0]):
+                stamp, tree, parent, result = entry
+
+                if parent is resolved:
+                    self.hits += 1
+                    resolved = result
+                    continue
+
+            else:
+                self.misses += 1
+                tree, stamp = read(level)
+
+            # Levels without metadata share the result of their parent
+            result = merge(resolved, tree) if tree else resolved
+
+            with self._lock:
+                self._levels.pop(level, None)
+                self._levels[level] = (stamp, tree, resolved, result)
+
+                while len(self._levels) > self.size:
+                    self._levels.popitem(last=False)
+
+            resolved = result
+
+        return resolved
+
+    def application(self, path, application):
+        """Return inherited ``apps/<application>`` of `path`"""
+        value = self.resolve(path).get(application)
+        return value if isinstance(value, dict) else dict()
+
+    def args(self, path, application):
+        """Return inherited arguments of `application` at `path`
+
+        Returns:
+            list: Names of arguments, in order of :func:`merge`
+
+        """
+
+        value = self.application(path, application).get(ARGS)
+        return list(value) if isinstance(value, dict) else list()
+
+    def kwargs(self, path, application):
+        """Return inherited keyword arguments of `application` at `path`
+
+        Returns:
+            list: (key, value) pairs, in order of :func:`merge`
+
+        """
+
+        value = self.application(path, application).get(KWARGS)
+        return list(value.items()) if isinstance(value, dict) else list()
+
+    def environment(self, path, application):
+        """Return inherited environment of `application` at `path`
+
+        Returns:
+            dict: Variables to add to those of the current process
+
+        """
+
+        value = self.application(path, application).get(ENVIRONMENT)
+        if not isinstance(value, dict):
+            return dict()
+
+        return dict((str(key), str(variable))
+                    for key, variable in value.items()
+                    if variable is not None)
+
+    def invalidate(self, path=None):
+        """Forget `path` and every level below it, or everything"""
+        with self._lock:
+            if path is None:
+                self._levels.clear()
+                return
+
+            prefix = path.rstrip(os.sep) + os.sep
+            for level in list(self._levels):
+                if level == path or level.startswith(prefix):
+                    del self._levels[level]
+
+    def stats(self):
+        """Return dictionary of counters, e.g. for logging"""
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._levels),
+                'capacity': self.size}
+
+
+resolver = Resolver()
@@ -0,0 +1,207 @@
+"""Asynchronous launching of workspaces
+
+Resolving a workspace and spawning its application both happen in
+background threads, such that the GUI never blocks on either.
+Processes started are tracked until they exit, which allows repeated
+launches of the same workspace to be refused or rate-limited.
+
+Independent of Qt, such that launching is available to scripts.
+Listeners are called from background threads; a GUI forwards them
+onto its own thread, e.g. by connecting them to Qt signals.
+
+"""
+
+# standard library
+import time
+import logging
+import threading
+import subprocess
+
+# local library
+import dash.plan
+import dash.trace
+import dash.worker
+
+log = logging.getLogger('dash.launcher')
+
+
+class Signal(object):
+    """Minimal, thread-safe stand-in for a Qt signal
+
+    Example:
+        >>> signal = Signal()
+        >>> signal.connect(lambda path: None)
+        >>> signal.emit('/projects/job')
+
+    """
+
+    def __init__(self):
+        self._listeners = list()
+        self._lock = threading.Lock()
+
+    def connect(self, listener):
+        with self._lock:
+            self._listeners.append(listener)
+
+    def disconnect(self, listener):
+        with self._lock:
+            self._listeners.remove(listener)
+
+    def emit(self, *args):
+        with self._lock:
+            listeners = list(self._listeners)
+
+        for listener in listeners:
+            try:
+                listener(*args)
+            except Exception:
+                log.exception("Listener %r failed" % listener)
+
+
+class Child(object):
+    """Process started by a :class:`Launcher`
+
+    Attributes:
+        path (str): Absolute path to workspace
+        pid (int): Process id
+        started (float): Time of launch, in seconds since epoch
+        returncode (int): Exit code, None whilst running
+
+    """
+
+    def __init__(self, path, process):
+        self.path = path
+        self.process = process
+        self.pid = process.pid
+        self.started = time.time()
+        self.returncode = None
+
+    @property
+    def running(self):
+        return self.returncode is None
+
+    def __repr__(self):
+        return "Child(%r, pid=%r, returncode=%r)" % (
+            self.path, self.pid, self.returncode)
+
+
+class Launcher(object):
+    """Resolve and spawn workspaces off of the GUI thread
+
+    Signals:
+        started (str, int): Workspace and pid of a launched process
+        finished (str, int): Workspace and exit code of a process
+        failed (str, str): Workspace and reason a launch failed
+
+    Arguments:
+        plans (dash.plan.PlanCache): Resolved plans
+        workers (int): Maximum concurrent launches being resolved
+        unique (bool): Refuse launching a workspace already running
+        interval (float): Minimum seconds between launches of
+            the same workspace.
+
+    """
+
+    def __init__(self, plans, workers=2, unique=True, interval=5.0):
+        self.started = Signal()
+        self.finished = Signal()
+        self.failed = Signal()
+
+        self.plans = plans
+        self.unique = unique
+        self.interval = interval
+        self.pool = dash.worker.Pool(workers)
+
+        self.children = list()
+        self.requested = dict()  # Path -> time of last launch
+        self._lock = threading.Lock()
+
+    def launch(self, path, env=None):
+        """Launch workspace at `path` in the background
+
+        Arguments:
+            path (str): Absolute path to workspace
+            env (dict, optional): Environment of launched process,
+                defaults to that inherited by the workspace.
+
+        Returns:
+            dash.worker.Task or None if the launch was refused
+
+        """
+
+        reason = self.refusal(path)
+        if reason:
+            self.failed.emit(path, reason)
+            return None
+
+        with self._lock:
+            self.requested[path] = time.time()
+
+        return self.pool.submit(self._launch, path, env)
+
+    def refusal(self, path):
+        """Return reason to not launch `path`, if any"""
+        if self.unique and self.running(path):
+            return "%s is already running" % path
+
+        with self._lock:
+            previous = self.requested.get(path)
+
+        if previous is not None and time.time() - previous < self.interval:
+            return "%s was launched less than %.0fs ago" % (
+                path, self.interval)
+
+        return None
+
+    def running(self, path=None):
+        """Return running children, optionally only those of `path`"""
+        with self._lock:
+            return [child for child in self.children
+                    if child.running and (path is None or
+                                          child.path == path)]
+
+    @dash.trace.timed('launcher.launch')
+    def _launch(self, path, env):
+        try:
+            plan = self.plans.get(path)
+        except Exception as e:
+            return self._fail(path, "Could not resolve: %s" % e)
+
+        if plan is None:
+            return self._fail(
+                path, "Application '%s' could not be found"
+                % dash.plan.application_from_path(path))
+
+        log.info("Running %s" % plan.argv)
+
+        try:
+            process = subprocess.Popen(plan.argv,
+                                       env=env or plan.env())
+        except OSError as e:
+            return self._fail(path, "Could not launch: %s" % e)
+
+        child = Child(path, process)
+
+        with self._lock:
+            self.children.append(child)
+
+        self.started.emit(path, child.pid)
+
+        waiter = threading.Thread(target=self._wait, args=(child,))
+        waiter.daemon = True
+        waiter.start()
+
+    def _fail(self, path, reason):
+        """Emit failure of `path`, which may be launched again at once"""
+        with self._lock:
+            self.requested.pop(path, None)
+
+        self.failed.emit(path, reason)
+
+    def _wait(self, child):
+        child.returncode = child.process.wait()
+
+        with self._lock:
+            self.children.remove(child)
+
+        self.finished.emit(child.path, child.returncode)
@@ -6,6 +6,7 @@ import argparse
 
 # local library
 import dash.version
+import dash.settings
 import dash.presentation
 
 log = logging.getLogger('dash')
@@ -24,12 +25,29 @@ Press CTRL-C to quit..
 
 
 if __name__ == '__main__':
+    timeline = dash.presentation.Timeline()
+
     parser = argparse.ArgumentParser()
     parser.add_argument('path', help="Absolute path to root directory")
+    parser.add_argument('--timing', action='store_true',
+                        help="Report time spent in each phase of startup")
+
+    parser.add_argument('--instrument', nargs='?', const='', default=None,
+                        metavar='OUTPUT',
+                        help="Time hot paths and count I/O, writing "
+                             "statistics to OUTPUT, or the log, on exit")
 
     args = parser.parse_args()
 
+    if args.instrument is not None:
+        dash.settings.INSTRUMENT = True
+        dash.settings.INSTRUMENT_OUTPUT = args.instrument or None
+        logging.getLogger('dash.trace').setLevel(logging.INFO)
+
+    if args.timing:
+        logging.getLogger('dash.startup').setLevel(logging.INFO)
+
     print message
     print "I: running Dash @ %r" % args.path
 
-    dash.presentation.main(path=args.path)
+    dash.presentation.main(path=args.path, timeline=timeline)
@@ -8,55 +8,215 @@ Attributes:
 
 # standard library
 import os
+import errno
+import shutil
+import timeit
+import functools
+from multiprocessing.pool import ThreadPool
 
-# pigui library
-import pifou.com
+# pifou library
 import pifou.metadata
 import pifou.domain.workspace
 
 # pigui library
 import pigui.pyqt5.model
 
+# pigui dependency
+from PyQt5 import QtCore
+
+# local library
+import dash.scan
+import dash.cache
+import dash.index
+import dash.search
+import dash.trace
+import dash.session
+import dash.watch
+import dash.worker
+import dash.prefetch
+import dash.settings
+
+try:
+    _intern = intern
+except NameError:
+    from sys import intern as _intern
+
 COMMAND = 'command'
 WORKSPACE = 'workspace'
 
 
-class Iterator(pifou.com.Iterator):
-    """Custom iterator for Dash
+def create_workspace(path):
+    """Physically create workspace at absolute `path`
+
+    Nothing is left behind should imprinting of metadata fail.
 
-    Dash traverses the COM differently from ``os.walk`` and this iterator
-    reflects that.
+    Raises:
+        OSError: If `path` could not be created
 
     """
 
-    def __init__(self, *args, **kwargs):
-        super(Iterator, self).__init__(*args, **kwargs)
+    os.makedirs(path)
+
+    try:
+        # Imprint metadata
+        loc = pifou.metadata.Location(path)
+        pifou.metadata.Entry('Workspace.class', parent=loc)
+        pifou.metadata.flush(loc)
 
-        if not self.filter:
-            self.filter = pifou.com.default_filter
+    except Exception:
+        shutil.rmtree(path, ignore_errors=True)
+        raise
+
+
+def _shared(value):
+    """Return a shared copy of `value`, for frequently repeated strings"""
+    try:
+        return _intern(value)
+    except TypeError:
+        # Only byte-strings may be interned on Python 2
+        return value
 
 
 class Item(pigui.pyqt5.model.ModelItem):
-    """Custom model-item for Dash"""
+    """Custom model-item for Dash
+
+    Data common to every item is stored in slots, rather than in the
+    general-purpose data dictionary, with types and commands interned
+    and paths stored relative to the parent. Any other data is stored
+    as usual.
+
+    Paths are stored as the segment relative to the parent; an empty
+    segment for items sharing the path of their parent, such as
+    commands, and an absolute path for items outside of their parent,
+    such as the children of a junction.
+
+    The full path is joined upon first access and cached along with
+    the path of the parent it was joined with. Renaming an item thus
+    only alters its own segment; each descendant notices the path of
+    its parent having changed upon next access, and joins anew.
+
+    """
+
+    __slots__ = ['_type',
+                 '_segment',
+                 '_path',
+                 '_display',
+                 '_group',
+                 '_sortkey',
+                 '_command']
+
+    # Data stored in slots, rather than in the data dictionary
+    fields = ('type', 'path', 'display', 'group', 'sortkey', 'command')
+
+    def __init__(self, data, parent=None):
+        data = dict(data)
+
+        self._type = _shared(data.pop('type', None))
+        self._display = data.pop('display', None)
+        self._group = data.pop('group', None)
+        self._sortkey = _shared(data.pop('sortkey', None))
+        self._command = _shared(data.pop('command', None))
+
+        path = data.pop('path', None)
+        super(Item, self).__init__(data, parent=parent)
+        self._segment = self.relative(path)
+        self._path = None
+
+    def relative(self, path):
+        """Return `path` relative to the path of the parent of this item"""
+        if path is None or self.parent is None:
+            return path
+
+        parent = self.parent.data('path')
+        if parent is None:
+            return path
+
+        if path == parent:
+            return ''
+
+        prefix = parent.rstrip('/\\')
+        if path.startswith(prefix) and path[len(prefix):len(prefix) + 1] in (
+                '/', '\\'):
+            return path[len(prefix) + 1:]
+
+        return path
+
+    def field(self, key):
+        """Return slot-stored data of `key`"""
+        if key == 'type':
+            return self._type
+
+        if key == 'path':
+            if self._segment is None or self.parent is None:
+                return self._segment
+
+            parent = self.parent.data('path')
+            if not self._segment:
+                return parent
+
+            # Valid for as long as the parent is at the same path
+            cached = self._path
+            if cached is not None and cached[0] is parent:
+                return cached[1]
+
+            path = os.path.join(parent, self._segment)
+            self._path = (parent, path)
+            return path
+
+        if key == 'display':
+            return self._display
+
+        if key == 'group':
+            return self._group
+
+        if key == 'sortkey':
+            return self._sortkey
+
+        return self._command
+
+    def set_data(self, key, value):
+        if key == 'type':
+            self._type = _shared(value)
+        elif key == 'path':
+            self._segment = self.relative(value)
+            self._path = None
+        elif key == 'display':
+            self._display = value
+        elif key == 'group':
+            self._group = value
+        elif key == 'sortkey':
+            self._sortkey = _shared(value)
+        elif key == 'command':
+            self._command = _shared(value)
+        else:
+            super(Item, self).set_data(key, value)
 
     def data(self, key):
-        """Custom intercept for Dash"""
-        value = super(Item, self).data(key)
+        """Custom intercept for Dash
+
+        `display` and `group` are computed upon access, unless
+        provided upon creation, as is the case for items from a scan.
+
+        """
 
-        if not value and self.data('type') in (pigui.pyqt5.model.Disk,
-                                               COMMAND,
-                                               WORKSPACE):
+        if key not in self.fields:
+            return super(Item, self).data(key)
+
+        value = self.field(key)
+
+        if value is None and self._type in (pigui.pyqt5.model.Disk,
+                                            COMMAND,
+                                            WORKSPACE):
             if key == 'display':
                 path = self.data('path')
                 basename = os.path.basename(path)
                 name, ext = os.path.splitext(basename)
-                self.set_data('display', name)
                 return name
 
             if key == 'group':
                 path = self.data('path')
                 isgroup = os.path.isdir(path)
-                self.set_data('group', isgroup)
+                self._group = isgroup
                 return isgroup
 
         return value
@@ -68,8 +228,93 @@ class Model(pigui.pyqt5.model.Model):
     Dash adds a number of items, most prominently the workspaces
     along with corresponding actions, such as "Launch".
 
+    Attributes:
+        threaded (bool): Read from disk in background threads,
+            streaming children into the model in batches.
+        batch_size (int): Number of children per batch
+        listings (dash.cache.ListingCache): Names and types of the
+            children of directories, shared by all pulls of this model
+            and classified anew upon each read, see :meth:`listing`.
+        watcher (dash.watch.Watcher): Watches directories of expanded
+            columns, None if watching is disabled.
+        watched (dict): Indexes of expanded columns, per watched path
+        watching (dict): Watched path, per index of expanded column
+        prefetcher (dash.prefetch.Prefetcher): Reads likely-next
+            columns ahead of time, see :meth:`prefetch`.
+        pool (dash.worker.Pool): Runs every read from disk, shared
+            with filters, see :func:`dash.worker.io`.
+        index (dash.index.WorkspaceIndex): Persistent index of
+            workspaces under the root, None if disabled or until
+            :meth:`setup`.
+        crawler (dash.index.Crawler): Keeps :attr:`index` current
+        search (dash.search.SearchIndex): Folders and workspaces seen
+            so far, for the quick-launch palette.
+        stale (set): Directories restored from the previous session,
+            served as-is until revalidated, see :meth:`revalidate`.
+        restored (dict): Entries of each of :attr:`stale`, as
+            classified in the previous session.
+
     """
 
+    # Emitted from worker threads, handled in the GUI thread
+    batch_ready = QtCore.pyqtSignal(object, str, object, bool)
+
+    # Emitted with index of parent once a pull of disk completes
+    loaded = QtCore.pyqtSignal(str)
+
+    # Emitted from worker threads with a fresh listing of an index
+    listing_ready = QtCore.pyqtSignal(str, object)
+
+    # Emitted from worker threads with a restored directory found changed
+    revalidated = QtCore.pyqtSignal(str)
+
+    def __init__(self, *args, **kwargs):
+        super(Model, self).__init__(*args, **kwargs)
+        self.threaded = dash.settings.ASYNC_PULL
+        self.batch_size = dash.settings.PULL_BATCH_SIZE
+        self.pool = dash.worker.io()
+        self.listings = dash.cache.ListingCache(
+            dash.settings.LISTING_CACHE_SIZE)
+
+        # Pulls in flight, per index
+        self.pulling = dict()
+
+        # Start of pulls, per index, whilst instrumented
+        self.pull_started = dict()
+
+        self.stale = set()
+        self.restored = dict()
+
+        # Junctions followed by children(), by path, see cached()
+        self.targets = dict()
+
+        self.watched = dict()
+        self.watching = dict()
+        self.watcher = None
+
+        if dash.settings.WATCH:
+            self.watcher = dash.watch.Watcher(
+                debounce=dash.settings.WATCH_DEBOUNCE,
+                latency=dash.settings.WATCH_LATENCY,
+                interval=dash.settings.WATCH_INTERVAL,
+                kind=dash.settings.WATCH_BACKEND,
+                parent=self)
+            self.watcher.changed.connect(self.changed_event)
+
+        self.index = None
+        self.crawler = None
+        self.search = dash.search.SearchIndex()
+        self.builder = None
+
+        self.prefetcher = dash.prefetch.Prefetcher(
+            self,
+            depth=dash.settings.PREFETCH_DEPTH,
+            limit=dash.settings.PREFETCH_LIMIT)
+
+        self.batch_ready.connect(self.batch_event)
+        self.listing_ready.connect(self.listing_event)
+        self.revalidated.connect(self.revalidated_event)
+
     def setup(self, root):
         """Custom setup for Dash
 
@@ -78,11 +323,95 @@ class Model(pigui.pyqt5.model.Model):
 
         """
 
+        # Opened here rather than upon construction, such
+        # that the window may be shown before touching disk.
+        if self.index is None and dash.settings.WORKSPACE_INDEX:
+            self.index = dash.index.WorkspaceIndex(
+                dash.settings.WORKSPACE_INDEX)
+
+        if self.index is not None:
+            if self.crawler is not None:
+                self.crawler.stop()
+
+            self.crawler = dash.index.Crawler(
+                self.index, root, dash.settings.CRAWL_INTERVAL)
+            self.crawler.start()
+
+            if self.builder is None:
+                self.builder = dash.search.Builder(self.search, self.index)
+                self.builder.start()
+
+        if dash.settings.SESSION:
+            restored = dash.session.restore(self, dash.settings.SESSION, root)
+            if restored:
+                self.stale.update(restored)
+                self.pool.request(('revalidate', root),
+                                  self.revalidate, (restored,),
+                                  priority=dash.worker.BACKGROUND)
+
         root = self.create_item({'type': 'disk',
                                  'path': root})
         self.root_item = root
         self.model_reset.emit()
 
+    def save(self):
+        """Save snapshot of expanded columns for the next session"""
+        if not dash.settings.SESSION:
+            return
+
+        try:
+            dash.session.save(self, dash.settings.SESSION,
+                              dash.settings.SESSION_SIZE)
+        except (IOError, OSError) as e:
+            self.error.emit(e)
+
+    def revalidate(self, paths):
+        """Check restored `paths` against disk, in the background
+
+        Directories modified since the previous session are read
+        again, and expanded columns of those patched in place,
+        see :meth:`revalidated_event`.
+
+        """
+
+        for path in paths:
+            mtime = self.listings.mtime(path)
+            entry = self.listings.peek(path)
+
+            # From here on, the listing is validated as usual
+            self.stale.discard(path)
+            self.restored.pop(path, None)
+
+            if entry is not None and entry[0] != mtime:
+                self.listings.invalidate(path)
+                dash.cache.metadata.invalidate(path)
+                self.revalidated.emit(path)
+
+    def revalidated_event(self, path):
+        """Restored `path` was outdated, patch columns showing it"""
+        for index, item in list(self.indexes.items()):
+            if (item.data('type') != 'disk' or
+                    not item.children or
+                    index in self.pulling):
+                continue
+
+            if self.target(item.data('path')) == path:
+                self.refresh(index)
+
+    def find_workspaces(self, application=None, under=None):
+        """Return paths of indexed workspaces
+
+        Arguments:
+            application (str, optional): E.g. "maya"
+            under (str, optional): Absolute path, e.g. to a job
+
+        """
+
+        if self.index is None:
+            return list()
+
+        return self.index.find(application=application, under=under)
+
     def create_item(self, data, parent=None):
         """Overridden to accommodate for custom Item (see above)"""
         assert isinstance(parent, basestring) or parent is None
@@ -125,12 +454,80 @@ class Model(pigui.pyqt5.model.Model):
                 old = os.path.basename(old_path)
                 new = os.path.basename(new_path)
                 self.status.emit("Renamed {} to {}".format(old, new))
+                self.listings.invalidate(dirname)
+                self.listings.invalidate(old_path)
+                dash.cache.metadata.invalidate(dirname)
 
-            # Update node with new name
-            self.set_data(index, key='path', value=basename)
+            # Update node with new name; descendants follow suit
+            # upon next access, see Item.
+            self.set_data(index, key='path', value=new_path)
+            self.moved(old_path, new_path)
 
         super(Model, self).set_data(index, key, value)
 
+    def moved(self, old_path, new_path):
+        """Follow directories watched at or below `old_path` to `new_path`
+
+        Proportional to the number of expanded columns, rather than
+        to the number of items below `old_path`. Entries of the search
+        index below `old_path` are removed, and added anew at
+        `new_path` as they are listed.
+
+        """
+
+        self.search.remove(old_path)
+
+        if self.watcher is None:
+            return
+
+        prefix = old_path.rstrip('/\\') + os.sep
+
+        for path, indexes in list(self.watched.items()):
+            if path == old_path:
+                moved = new_path
+            elif path.startswith(prefix):
+                moved = os.path.join(new_path, path[len(prefix):])
+            else:
+                continue
+
+            self.watcher.unwatch(path)
+            del self.watched[path]
+
+            self.watched.setdefault(moved, set()).update(indexes)
+            for index in indexes:
+                self.watching[index] = moved
+
+            self.watcher.watch(moved)
+
+    def remove_item(self, index):
+        """Overridden to also forget descendants of `index`"""
+        self.release(index)
+        self.unwatch(index)
+        super(Model, self).remove_item(index)
+
+    def release(self, index):
+        """Forget every descendant of `index`
+
+        Without this, every item ever pulled would remain
+        in :attr:`indexes` for the lifetime of the model.
+
+        """
+
+        item = self.item(index)
+        stack = list(item.children)
+
+        while stack:
+            child = stack.pop()
+            stack.extend(child.children)
+            self.indexes.pop(child.index, None)
+            self.unwatch(child.index)
+
+            task = self.pulling.pop(child.index, None)
+            if task is not None:
+                task.cancel()
+
+        del item.children[:]
+
     def remove_workspace(self, index):
         """Remove workspace at index `index`
 
@@ -139,6 +536,9 @@ class Model(pigui.pyqt5.model.Model):
         """
 
         parent = self.item(index).parent.index
+        path = self.data(parent, 'path')
+        self.listings.invalidate(os.path.dirname(path))
+        self.search.remove(path)
         self.remove_item(parent)
         self.status.emit("Workspace removed")
 
@@ -152,29 +552,236 @@ class Model(pigui.pyqt5.model.Model):
 
         """
 
-        workspace = pifou.domain.workspace.assemble(root=root,
-                                                    application=application)
+        return self.add_workspaces([(root, application)],
+                                   parents={root: parent})
+
+    def add_workspaces(self, workspaces, parents=None):
+        """Add many workspaces at once
+
+        Directories and metadata are created concurrently. Should any
+        fail, those already created are removed again and nothing is
+        added to the model.
+
+        Arguments:
+            workspaces (list): (root, application) pairs
+            parents (dict, optional): Index of parent per root,
+                defaults to any item of the model at each root.
+
+        Returns:
+            list: Absolute paths of workspaces created, empty on failure
+
+        """
+
+        if not workspaces:
+            return list()
+
+        paths = list()
+        for root, application in workspaces:
+            path = pifou.domain.workspace.assemble(root=root,
+                                                   application=application)
+            if os.path.exists(path):
+                self.error.emit(ValueError("%s already exists" % path))
+                return list()
+
+            paths.append(path)
+
+        created = list()
+        failures = list()
+
+        def create(path):
+            try:
+                create_workspace(path)
+            except Exception as e:
+                failures.append(e)
+            else:
+                created.append(path)
 
-        if os.path.exists(workspace):
-            self.error.emit(ValueError("%s already exists" % workspace))
+        pool = ThreadPool(min(dash.settings.CREATE_WORKERS, len(paths)))
 
         try:
-            # Physically instantiate node
-            os.makedirs(workspace)
+            pool.map(create, paths)
+        finally:
+            pool.close()
 
-            # Imprint metadata
-            loc = pifou.metadata.Location(workspace)
-            pifou.metadata.Entry('Workspace.class', parent=loc)
-            pifou.metadata.flush(loc)
+            for root, application in workspaces:
+                self.listings.invalidate(root)
+                dash.cache.metadata.invalidate(root)
 
-        except Exception as e:
-            return self.error.emit(e)
+        if failures:
+            for path in created:
+                shutil.rmtree(path, ignore_errors=True)
+
+            self.error.emit(failures[0])
+            return list()
+
+        # Parents already in the model receive their workspaces
+        parents = dict(parents or {})
+        roots = set(root for root, application in workspaces)
+        for index, item in list(self.indexes.items()):
+            if len(parents) == len(roots):
+                break
+
+            path = item.data('path')
+            if path in roots and item.data('type') == 'disk':
+                parents.setdefault(path, index)
+
+        for (root, application), path in zip(workspaces, paths):
+            parent = parents.get(root)
+            if parent not in self.indexes:
+                continue
+
+            # Announced to views, unlike items created during a pull
+            self.add_item({'type': 'workspace',
+                           'path': path}, parent=parent)
+
+        if len(paths) == 1:
+            self.status.emit("Workspace added")
+        else:
+            self.status.emit("%i workspaces added" % len(paths))
+
+        return paths
+
+    def target(self, path):
+        """Return directory listed for `path`, following any junction"""
+        return dash.cache.junctions.target(path)
+
+    def children(self, path):
+        """Yield data for children of `path`, as read from disk
+
+        Safe to call from any thread.
+
+        Arguments:
+            path (str): Absolute path to directory
+
+        """
 
-        print "Adding item: %s" % root
-        self.add_item({'type': 'workspace',
-                       'path': workspace}, parent=parent)
-        self.status.emit("Workspace added")
+        target = self.target(path)
 
+        if target != path:
+            self.targets[path] = target
+        else:
+            self.targets.pop(path, None)
+
+        try:
+            listing = self.listing(target)
+        except OSError as e:
+            self.status.emit("%s %s" % (target, e.strerror))
+            return
+
+        for data in self.entries(target, listing):
+            yield data
+
+    def entries(self, path, listing):
+        """Yield data for `listing` of directory at `path`"""
+        for entry in listing:
+            data = {'type': entry.type,
+                    'path': os.path.join(path, entry.name),
+                    'display': dash.scan.display(entry.name),
+                    'group': entry.group}
+
+            if entry.type == WORKSPACE:
+                data['sortkey'] = '|'
+
+            yield data
+
+    def prefetch(self, index):
+        """The user is likely to open `index` next; read it ahead of time"""
+        self.prefetcher.hint(index)
+
+    def cached(self, index):
+        """Return data for children of `index` held in memory, or None
+
+        Runs on the GUI thread, and so never touches disk; junctions
+        are followed as last resolved by :meth:`children`, and the
+        listing is left to be revalidated by the caller.
+
+        """
+
+        path = self.data(index, 'path')
+        target = self.targets.get(path, path)
+
+        listing = self.restored.get(target)
+
+        if listing is None:
+            entry = self.listings.peek(target)
+            values = dash.cache.metadata.peek(target)
+
+            if entry is None or values is None:
+                return None
+
+            listing = dash.scan.classify(entry[1], values)
+
+        return list(self.entries(target, listing))
+
+    def listing(self, path):
+        """Return entries of directory at `path`, scanning it if need be
+
+        Safe to call from any thread.
+
+        Arguments:
+            path (str): Absolute path to directory, junctions
+                are not followed.
+
+        Returns:
+            list of dash.scan.Entry
+
+        Raises:
+            OSError: If `path` could not be listed
+
+        """
+
+        # Restored from the previous session, pending revalidation
+        if path in self.stale:
+            listing = self.restored.get(path)
+            if listing is not None:
+                return listing
+
+        names = self.listings.get(path)
+
+        if names is not None:
+            return self.classify(path, names)
+
+        # Sample mtime prior to listing, such that any
+        # modification during the listing invalidates it.
+        mtime = self.listings.mtime(path)
+
+        if mtime is None:
+            raise OSError(errno.ENOENT, "did not exist", path)
+
+        names = sorted(dash.scan.entries(path))
+        self.listings.put(path, names, mtime)
+        listing = self.classify(path, names)
+
+        # Keep the index current, for free
+        if self.index is not None:
+            self.index.record(path, mtime, listing)
+
+        return listing
+
+    @dash.trace.timed('model.classify')
+    def classify(self, path, names):
+        """Return entries of `names`, children of `path`, as classified now
+
+        The metadata of each child is validated, as a child may become
+        hidden or a workspace without the modification time of `path`
+        changing, e.g. once another artist finishes creating it.
+
+        """
+
+        folders = [name for name, isdir in names if isdir]
+        values = dash.cache.metadata.directory(path, folders)
+        listing = dash.scan.classify(names, values)
+
+        for entry in listing:
+            if entry.type == WORKSPACE:
+                self.search.add(os.path.join(path, entry.name), WORKSPACE)
+            elif entry.group:
+                self.search.add(os.path.join(path, entry.name),
+                                dash.search.FOLDER)
+
+        return listing
+
+    @dash.trace.timed('model.pull')
     def pull(self, index):
         """Populate item at index `index` with content from disk
 
@@ -184,35 +791,46 @@ class Model(pigui.pyqt5.model.Model):
 
         """
 
-        self.add_header(index)
+        # Replace, rather than append to, children of a previous pull
+        self.release(index)
 
         if self.data(index, 'type') == 'disk':
-            path = self.data(index, 'path')
+            if dash.trace.enabled:
+                self.pull_started[index] = timeit.default_timer()
 
-            # Is there a junction involved?
-            junction = pifou.metadata.read(path, 'junction.string')
-            if junction:
-                path = os.path.join(path, junction)
+            # Prefetched columns are read from memory, in place
+            children = self.cached(index) if self.threaded else None
 
-            if os.path.exists(path):
-                for basename in Iterator(path):
-                    fullpath = os.path.join(path, basename)
-                    self.create_item({'type': 'disk',
-                                      'path': fullpath}, parent=index)
-            else:
-                self.status.emit("%s did not exist" % path)
+            if self.threaded and children is None:
+                return self.pull_async(index)
 
-            # Append workspaces
-            for workspace in pifou.domain.workspace.ls(path):
-                full_path = os.path.join(path, workspace)
-                self.create_item({'type': 'workspace',
-                                  'path': full_path,
-                                  'sortkey': '|'}, parent=index)
+            # Batches of an earlier pull, still queued, would add to these
+            previous = self.pulling.pop(index, None)
+            if previous is not None:
+                previous.cancel()
+                super(Model, self).set_data(index, 'loading', False)
+
+            self.add_header(index)
+
+            if children is None:
+                children = self.children(self.data(index, 'path'))
+
+            for data in children:
+                self.create_item(data, parent=index)
 
             self.add_footer(index)
+            self.watch(index)
+            self.loaded.emit(index)
+            self.report(index)
+
+            # Served from memory; validated against disk in the background
+            if self.threaded:
+                self.refresh(index)
 
         # Append commands to workspaces
         elif self.data(index, 'type') == 'workspace':
+            self.add_header(index)
+
             path = self.data(index, 'path')
             for command in ('launch', 'configure', 'remove'):
                 self.create_item({'type': 'command',
@@ -220,4 +838,252 @@ class Model(pigui.pyqt5.model.Model):
                                   'command': command}, parent=index)
 
         else:
+            self.add_header(index)
+            self.add_footer(index)
+
+    def pull_async(self, index):
+        """Populate item at index `index` from a background thread
+
+        The header is added immediately and flagged as `loading`,
+        children arrive in batches of :attr:`batch_size` and the
+        footer is added once the read is complete.
+
+        The read is given precedence over any other, and pulls of
+        columns navigated away from are abandoned, see :meth:`abandon`.
+
+        Arguments:
+            index (str): Index of item within model
+
+        """
+
+        previous = self.pulling.pop(index, None)
+        if previous is not None:
+            previous.cancel()
+
+        self.abandon(index)
+
+        path = self.data(index, 'path')
+
+        super(Model, self).set_data(index, 'loading', True)
+        self.add_header(index)
+        self.status.emit("Loading %s.." % os.path.basename(path))
+
+        request = self.pool.request(('children', path),
+                                    self.read, (path,),
+                                    callback=functools.partial(
+                                        self._deliver, index),
+                                    priority=dash.worker.FOCUS)
+        self.pulling[index] = request
+        return request
+
+    def abandon(self, index):
+        """Cancel pulls of the siblings of `index`, and of their children
+
+        In a Miller view, opening `index` replaces the columns of its
+        siblings and of anything below those. Pulls elsewhere, such as
+        of columns of another view, are left alone.
+
+        """
+
+        parent = self.item(index).parent
+        if parent is None:
+            return
+
+        for other, request in list(self.pulling.items()):
+            if other in (index, parent.index):
+                continue
+
+            item = self.indexes.get(other)
+            while item is not None and item is not parent:
+                item = item.parent
+
+            if item is None:
+                continue
+
+            request.cancel()
+            del self.pulling[other]
+
+            # Partially read; pulled anew when next opened
+            self.release(other)
+            super(Model, self).set_data(other, 'loading', False)
+
+    def read(self, path):
+        """Return data of the children of `path`
+
+        Runs in a worker thread, shared by every request of `path`,
+        and returns early once every request has been cancelled.
+
+        """
+
+        task = dash.worker.current()
+        children = list()
+
+        try:
+            with dash.trace.span('model.pull.read'):
+                for data in self.children(path):
+                    if task is not None and task.cancelled:
+                        break
+
+                    children.append(data)
+
+        except Exception as e:
+            self.error.emit(e)
+
+        return children
+
+    def _deliver(self, index, request, children):
+        """Emit `children` of `index` in batches
+
+        Runs in a worker thread.
+
+        """
+
+        batches = [children[position:position + self.batch_size]
+                   for position in range(0, len(children),
+                                         self.batch_size)] or [[]]
+
+        for number, batch in enumerate(batches):
+            if request.cancelled:
+                return
+
+            self.batch_ready.emit(request, index, batch,
+                                  number == len(batches) - 1)
+
+    def batch_event(self, request, index, batch, done):
+        """Add `batch` of children to `index`
+
+        Batches from cancelled pulls, or for items no longer
+        in the model, are discarded. Children are announced to
+        views, as they arrive after :meth:`pull` has returned.
+
+        """
+
+        if request.cancelled or index not in self.indexes:
+            return
+
+        for data in batch:
+            self.add_item(data, parent=index)
+
+        if done:
+            self.pulling.pop(index, None)
+            super(Model, self).set_data(index, 'loading', False)
             self.add_footer(index)
+            self.watch(index)
+            self.loaded.emit(index)
+            self.report(index)
+
+    def report(self, index):
+        """Show time taken to load `index`, when instrumented"""
+        started = self.pull_started.pop(index, None)
+        if started is None:
+            return
+
+        self.status.emit("Loaded %s in %.0f ms" % (
+            os.path.basename(self.data(index, 'path')),
+            (timeit.default_timer() - started) * 1000))
+
+    def watch(self, index):
+        """Keep children of `index` up to date with changes on disk"""
+        if self.watcher is None:
+            return
+
+        self.unwatch(index)
+
+        path = self.target(self.data(index, 'path'))
+        indexes = self.watched.setdefault(path, set())
+        indexes.add(index)
+        self.watching[index] = path
+
+        # Columns showing the same directory share a watch
+        if len(indexes) == 1:
+            self.watcher.watch(path)
+
+    def unwatch(self, index):
+        """Stop keeping children of `index` up to date"""
+        path = self.watching.pop(index, None)
+        if path is None:
+            return
+
+        indexes = self.watched.get(path, set())
+        indexes.discard(index)
+
+        if not indexes:
+            self.watched.pop(path, None)
+            self.watcher.unwatch(path)
+
+    def changed_event(self, path):
+        """Directory at `path` has changed on disk
+
+        Changes are applied to every column showing `path` once a
+        fresh listing has been read in the background, see
+        :meth:`listing_event`.
+
+        """
+
+        self.listings.invalidate(path)
+        dash.cache.metadata.invalidate(path)
+
+        for index in list(self.watched.get(path, ())):
+            # An ongoing pull will pick up changes by itself
+            if index in self.pulling:
+                continue
+
+            self.refresh(index)
+
+    def refresh(self, index):
+        """Read children of `index` anew, see :meth:`listing_event`"""
+        self.pool.request(('children', self.data(index, 'path')),
+                          self.read, (self.data(index, 'path'),),
+                          callback=functools.partial(self._refreshed, index),
+                          priority=dash.worker.VISIBLE,
+                          fresh=True)
+
+    def _refreshed(self, index, request, children):
+        self.listing_ready.emit(index, children)
+
+    def listing_event(self, index, listing):
+        """Apply difference between `listing` and children of `index`
+
+        Only children which have been added or removed are
+        affected; a rename is a removal followed by an addition, as
+        is a folder becoming a workspace. Added children take their
+        place in `listing`, ahead of the footer.
+
+        """
+
+        if index not in self.indexes or index in self.pulling:
+            return
+
+        children = self.item(index).children
+
+        existing = dict()
+        for child in children:
+            if child.data('type') in ('disk', WORKSPACE):
+                existing[(child.data('path'), child.data('type'))] = child
+
+        current = set((data['path'], data['type']) for data in listing)
+
+        for key, child in existing.items():
+            if key not in current:
+                self.remove_item(child.index)
+
+        # Children follow the header and precede the footer
+        end = len(children)
+        if children and children[-1].data('type') not in ('disk', WORKSPACE):
+            end -= 1
+
+        # Added children are appended, and moved into listing order
+        following = None
+        for data in reversed(listing):
+            child = existing.get((data['path'], data['type']))
+
+            if child is None:
+                self.add_item(data, parent=index)
+                child = children.pop()
+
+                if following is None:
+                    children.insert(end, child)
+                else:
+                    children.insert(children.index(following), child)
+
+            following = child
@@ -0,0 +1,100 @@
+"""Quick-launch palette for Dash
+
+Type to search every folder and workspace under the root, press
+Enter to launch the selected workspace. Choosing a folder narrows
+the search to within it.
+
+"""
+
+# standard library
+import os
+
+# pigui dependency
+from PyQt5 import QtCore
+from PyQt5 import QtWidgets
+
+# local library
+import dash.search
+
+
+class QuickLaunch(QtWidgets.QDialog):
+    """Search-as-you-type palette
+
+    Signals:
+        launch (str): Emits absolute path of workspace to launch
+
+    Arguments:
+        search (dash.search.SearchIndex): Index to search
+        parent (QtWidgets.QWidget): Qt parent of this widget
+
+    """
+
+    launch = QtCore.pyqtSignal(str)
+
+    def __init__(self, search, parent=None):
+        super(QuickLaunch, self).__init__(parent)
+        self.setObjectName('QuickLaunch')
+        self.setWindowTitle("Quick launch")
+        self.setWindowFlags(QtCore.Qt.Popup)
+
+        editor = QtWidgets.QLineEdit()
+        editor.setPlaceholderText("Search workspaces..")
+
+        results = QtWidgets.QListWidget()
+        results.setFocusPolicy(QtCore.Qt.NoFocus)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(3, 3, 3, 3)
+        layout.addWidget(editor)
+        layout.addWidget(results)
+
+        editor.textChanged.connect(self.search_event)
+        editor.returnPressed.connect(self.accept_event)
+        results.itemActivated.connect(self.accept_event)
+
+        self.search = search
+        self.editor = editor
+        self.results = results
+
+    def showEvent(self, event):
+        super(QuickLaunch, self).showEvent(event)
+        self.editor.setFocus()
+        self.editor.selectAll()
+
+    def keyPressEvent(self, event):
+        """Navigate results whilst typing"""
+        key = event.key()
+
+        if key in (QtCore.Qt.Key_Down, QtCore.Qt.Key_Up):
+            step = 1 if key == QtCore.Qt.Key_Down else -1
+            row = self.results.currentRow() + step
+            row = max(0, min(self.results.count() - 1, row))
+            self.results.setCurrentRow(row)
+            return
+
+        super(QuickLaunch, self).keyPressEvent(event)
+
+    def search_event(self, text):
+        self.results.clear()
+
+        for path, kind in self.search.search(text):
+            item = QtWidgets.QListWidgetItem(path)
+            item.setData(QtCore.Qt.UserRole, kind)
+            self.results.addItem(item)
+
+        self.results.setCurrentRow(0)
+
+    def accept_event(self, *args):
+        item = self.results.currentItem()
+        if item is None:
+            return
+
+        path = item.text()
+
+        if item.data(QtCore.Qt.UserRole) == dash.search.WORKSPACE:
+            self.launch.emit(path)
+            self.close()
+        else:
+            # Narrow down to the chosen folder
+            basename = os.path.basename(path.rstrip('/\\'))
+            self.editor.setText(basename + ' ')
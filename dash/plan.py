@@ -0,0 +1,323 @@
+"""Launch plans for Dash
+
+A plan is the fully resolved command-line of a workspace; the
+executable found on PATH along with arguments, keyword arguments
+and environment inherited via metadata. Resolving it involves scanning PATH and
+walking metadata up the hierarchy, so plans are cached and only
+re-resolved when anything they were resolved from has changed.
+
+"""
+
+# standard library
+import os
+import logging
+import threading
+
+# pifou library
+import pifou.lib
+
+# local library
+import dash.trace
+import dash.worker
+import dash.inherit
+
+log = logging.getLogger('dash.plan')
+
+
+class Plan(object):
+    """Resolved command-line of `application` at `path`
+
+    Attributes:
+        path (str): Absolute path to workspace
+        application (str): Name of application, e.g. "maya"
+        executable (str): Absolute path to executable
+        argv (list): Full command, including executable
+        environment (dict): Variables added to those of the
+            current process upon launch.
+        stamp (tuple): State of everything the plan was resolved
+            from, see :func:`stamp`.
+
+    """
+
+    def __init__(self, path, application, executable, argv, stamp,
+                 environment=None):
+        self.path = path
+        self.application = application
+        self.executable = executable
+        self.argv = argv
+        self.environment = environment or dict()
+        self.stamp = stamp
+
+    def env(self):
+        """Return full environment of launch, or None if unchanged"""
+        if not self.environment:
+            return None
+
+        env = dict(os.environ)
+        env.update(self.environment)
+        return env
+
+    def __repr__(self):
+        return "Plan(%r, %r)" % (self.path, self.argv)
+
+
+def application_from_path(path):
+    """Return name of application of workspace at `path`"""
+    basename = os.path.basename(path)
+    application, _ = os.path.splitext(basename)
+    return application
+
+
+def ancestors(path):
+    """Yield `path` followed by each of its parents, up to root"""
+    path = os.path.abspath(path)
+
+    while True:
+        yield path
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+
+        path = parent
+
+
+def mtime(path):
+    dash.trace.count('stat')
+
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def stamp(path, executable, application=None):
+    """Return state of everything a plan for `path` depends on
+
+    That is, the modification time of ``.meta`` and the groups of
+    `application` within it, along with every value within those,
+    at each level of the inheritance chain; and the executable
+    and PATH.
+
+    Values are stamped individually, as editing one in place
+    leaves the modification time of its group as-is.
+
+    Returns:
+        tuple: (path, mtime) pairs followed by PATH, see :func:`current`
+
+    """
+
+    application = application or application_from_path(path)
+    groups = ('apps',
+              os.path.join('apps', application))
+    values = (os.path.join('apps', application, 'args'),
+              os.path.join('apps', application, 'kwargs'),
+              os.path.join('apps', application, 'environment'))
+
+    pairs = list()
+    for level in ancestors(path):
+        meta = os.path.join(level, '.meta')
+        level_mtime = mtime(meta)
+        pairs.append((meta, level_mtime))
+
+        # Levels without metadata cost a single stat
+        if level_mtime is None:
+            continue
+
+        for group in groups:
+            group = os.path.join(meta, group)
+            pairs.append((group, mtime(group)))
+
+        for group in values:
+            group = os.path.join(meta, group)
+            group_mtime = mtime(group)
+            pairs.append((group, group_mtime))
+
+            if group_mtime is not None:
+                pairs.extend(walk(group))
+
+    if executable:
+        pairs.append((executable, mtime(executable)))
+
+    return tuple(pairs), os.environ.get('PATH')
+
+
+def walk(directory):
+    """Return (path, mtime) of everything below `directory`"""
+    pairs = list()
+    dash.trace.count('listdir')
+
+    for root, dirnames, filenames in os.walk(directory):
+        for basename in dirnames + filenames:
+            child = os.path.join(root, basename)
+            pairs.append((child, mtime(child)))
+
+    return pairs
+
+
+def current(state):
+    """Return whether `state`, as returned by :func:`stamp`, still holds
+
+    Costs a ``stat`` per pair, rather than walking metadata again.
+
+    """
+
+    pairs, path = state
+
+    if path != os.environ.get('PATH'):
+        return False
+
+    return all(mtime(filename) == modified for filename, modified in pairs)
+
+
+@dash.trace.timed('plan.resolve')
+def resolve(path, executable=None):
+    """Resolve plan for workspace at `path`
+
+    Arguments:
+        path (str): Absolute path to workspace
+        executable (str, optional): Previously resolved executable,
+            PATH is only scanned if omitted.
+
+    Returns:
+        Plan or None if the application could not be found
+
+    """
+
+    application = application_from_path(path)
+
+    exe = executable or pifou.lib.where(application)
+    if not exe:
+        log.info("Application '{0}' could "
+                 "not be found".format(application))
+        return None
+
+    # Sampled prior to reading, such that changes made
+    # during resolution invalidate the plan.
+    state = stamp(path, exe, application)
+
+    cmd = list()
+    cmd.append(exe)
+
+    # Get arguments
+    cmd.extend(dash.inherit.resolver.args(path, application))
+
+    # Get keyword arguments
+    for key, value in dash.inherit.resolver.kwargs(path, application):
+        cmd.append(key)
+        cmd.append(value)
+
+    # Resolve keywords
+    keywords = {
+        '$workspace': path,
+    }
+
+    for part in cmd:
+        index = cmd.index(part)
+        part = str(part).lower()
+
+        try:
+            keyword = keywords[part]
+            cmd[index] = keyword
+
+        except KeyError:
+            pass
+
+    environment = dash.inherit.resolver.environment(path, application)
+    for key, value in environment.items():
+        environment[key] = keywords.get(value.lower(), value)
+
+    return Plan(path=path,
+                application=application,
+                executable=exe,
+                argv=cmd,
+                environment=environment,
+                stamp=state)
+
+
+class PlanCache(object):
+    """Resolved plans, keyed by (path, application)
+
+    Plans are validated upon each :meth:`get` via :func:`current`,
+    which costs one ``stat`` per level of the hierarchy, and per
+    group and value of levels with metadata, rather than walking
+    metadata and PATH.
+
+    Arguments:
+        workers (int): Threads used by :meth:`warm`
+
+    """
+
+    def __init__(self, workers=1):
+        self.hits = 0
+        self.misses = 0
+
+        self._plans = dict()
+        self._lock = threading.Lock()
+        self._pool = dash.worker.Pool(workers)
+
+    def get(self, path):
+        """Return valid plan for `path`, resolving it if necessary
+
+        Returns:
+            Plan or None if the application could not be found
+
+        """
+
+        key = (path, application_from_path(path))
+
+        with self._lock:
+            plan = self._plans.get(key)
+
+        if plan is not None:
+            if current(plan.stamp):
+                self.hits += 1
+                return plan
+
+            # Only scan PATH again if it, or the executable, changed
+            executable = plan.executable
+            if (plan.stamp[-1] != os.environ.get('PATH') or
+                    not os.path.isfile(executable)):
+                executable = None
+
+        else:
+            executable = None
+
+        self.misses += 1
+        plan = resolve(path, executable)
+
+        with self._lock:
+            if plan is None:
+                self._plans.pop(key, None)
+            else:
+                self._plans[key] = plan
+
+        return plan
+
+    def warm(self, paths):
+        """Resolve plans for `paths` in the background
+
+        Arguments:
+            paths (list): Absolute paths to workspaces
+
+        """
+
+        for path in paths:
+            self._pool.submit(self.get, path)
+
+    def invalidate(self, path=None):
+        """Forget plans at or below `path`, or every plan"""
+        with self._lock:
+            if path is None:
+                self._plans.clear()
+                return
+
+            for key in list(self._plans):
+                if key[0] == path or key[0].startswith(
+                        path.rstrip(os.sep) + os.sep):
+                    del self._plans[key]
+
+    def stats(self):
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._plans)}
@@ -0,0 +1,133 @@
+"""Speculative prefetching for Dash
+
+In a Miller view, the next column opened is very predictable; the
+folder under the mouse or keyboard, or the only child of the column
+just opened. These are read ahead of time into the listing cache of
+the model, such that opening them is instant.
+
+"""
+
+# standard library
+import logging
+import threading
+import functools
+import collections
+
+# local library
+import dash.scan
+import dash.worker
+
+log = logging.getLogger('dash.prefetch')
+
+
+class Prefetcher(object):
+    """Read likely-next directories of `model` in the background
+
+    Each :meth:`hint` supersedes the previous one; prefetches no
+    longer relevant are dropped before they start, or abandoned
+    between levels.
+
+    Reads are requested from the pool of the model at the lowest
+    priority, and are shared with a pull of the same directory
+    should the user open it before it has been read. As priority
+    only orders reads yet to start, at most `limit` are in flight
+    at once, the rest waiting their turn, such that prefetching
+    never occupies every worker of the pool.
+
+    Arguments:
+        model (dash.model.Model): Model whose listings to populate
+        depth (int): Levels to follow down folders with
+            a single child folder.
+        limit (int): Maximum number of prefetches in flight
+
+    """
+
+    def __init__(self, model, depth=2, limit=2):
+        self.model = model
+        self.depth = depth
+        self.limit = limit
+
+        self.requests = list()
+        self.pending = collections.deque()
+        self.prefetched = 0
+        self._lock = threading.Lock()
+
+        model.loaded.connect(self.loaded_event)
+
+    def hint(self, index):
+        """The user is likely to open `index` next"""
+        if self.model.data(index, 'type') != dash.scan.DISK:
+            return
+
+        if not self.model.data(index, 'group'):
+            return
+
+        self.prefetch([self.model.data(index, 'path')])
+
+    def prefetch(self, paths):
+        """Read `paths` in the background, cancelling earlier prefetches"""
+        with self._lock:
+            for request in self.requests:
+                request.cancel()
+
+            self.requests = list()
+            self.pending.clear()
+
+        for path in paths:
+            self._request(path, 0)
+
+    def loaded_event(self, index):
+        """Prefetch the only child folder of a freshly loaded column"""
+        folders = list()
+
+        for child in self.model.item(index).children:
+            if (child.data('type') == dash.scan.DISK and
+                    child.data('group')):
+                folders.append(child.data('path'))
+
+                if len(folders) > 1:
+                    return
+
+        if folders:
+            self.prefetch(folders)
+
+    def _request(self, path, level):
+        with self._lock:
+            if len(self.requests) >= self.limit:
+                self.pending.append((path, level))
+                return
+
+            request = self.model.pool.request(
+                ('children', path), self.model.read, (path,),
+                callback=functools.partial(self._prefetched, path, level),
+                priority=dash.worker.BACKGROUND)
+
+            self.requests.append(request)
+
+    def _prefetched(self, path, level, request, children):
+        """Continue down the only child folder of `path`, if any
+
+        Runs in a worker thread.
+
+        """
+
+        with self._lock:
+            if request not in self.requests:
+                return
+
+            # Making room for the next in line
+            self.requests.remove(request)
+            pending = list(self.pending)
+            self.pending.clear()
+
+        self.prefetched += 1
+        log.debug("Prefetched %s" % path)
+
+        folders = [data for data in children
+                   if data['type'] == dash.scan.DISK and data['group']]
+
+        if len(folders) == 1 and level + 1 < self.depth:
+            pending.insert(0, (folders[0]['path'], level + 1))
+
+        for path, level in pending:
+            self._request(path, level)
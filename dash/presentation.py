@@ -1,34 +1,119 @@
+"""Entry point of the Dash GUI
+
+The window is shown as soon as possible; the model, and with it
+the delegates, watchers and indexes, are created once the event
+loop is running and the window is already on screen.
+
+Time spent in each phase of startup is recorded, see
+:class:`Timeline`, and logged once the root has been populated.
+With instrumentation enabled, see :mod:`dash.trace`, aggregate
+statistics are written upon exit.
+
+"""
 
 from __future__ import absolute_import
 
-# pipi library
-import pifou
-import pigui
+# standard library
+import time
+import logging
+
+log = logging.getLogger('dash.startup')
+
+
+class Timeline(object):
+    """Time spent in consecutive phases of startup
+
+    Example:
+        >>> timeline = Timeline()
+        >>> timeline.mark('imports')
+        >>> timeline.mark('window')
+        >>> print(timeline.report())
+
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.phases = list()
+        self._last = self.started
+
+    def mark(self, phase):
+        """Record end of `phase`, begun at the end of the previous one"""
+        now = time.time()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self.started
+
+    def report(self):
+        """Return human-readable summary of recorded phases"""
+        lines = ["Startup in %.0f ms" % (self.total() * 1000)]
+        for phase, duration in self.phases:
+            lines.append("  %-12s %6.0f ms" % (phase, duration * 1000))
+        return "\n".join(lines)
+
+
+def main(path, timeline=None):
+    """Show Dash for `path`
 
-# local library
-import dash.controller
-import dash.application
+    Arguments:
+        path (str): Absolute path to root directory
+        timeline (Timeline, optional): Startup timeline, begun by
+            the caller so as to include the caller's imports.
 
-pifou.setup_log()
-pigui.setup_log()
+    """
 
+    timeline = timeline or Timeline()
 
-def main(path):
+    import pifou
+    import pigui
     import pigui.pyqt5.util
 
+    pifou.setup_log()
+    pigui.setup_log()
+
+    from PyQt5 import QtCore
+    from PyQt5 import QtWidgets
+
+    import dash.trace
+    import dash.settings
+    import dash.application
+    timeline.mark('libraries')
+
+    if dash.settings.INSTRUMENT:
+        dash.trace.enable()
+
     with pigui.pyqt5.util.application_context():
+        import dash.controller
+        timeline.mark('qt')
+
         win = dash.controller.Dash()
         app = dash.application.Dash()
-
-        model = dash.model.Model()
-
         app.set_controller(win)
-        app.set_model(model)
-
-        model.setup(path)
 
         win.resize(*dash.settings.WINDOW_SIZE)
         win.animated_show()
+        timeline.mark('window')
+
+        def populate():
+            import dash.model
+            timeline.mark('model-import')
+
+            model = dash.model.Model()
+            app.set_model(model)
+            model.setup(path)
+
+            QtWidgets.QApplication.instance().aboutToQuit.connect(
+                model.save)
+            timeline.mark('populate')
+
+            log.info(timeline.report())
+
+        # Once the window is on screen
+        QtCore.QTimer.singleShot(0, populate)
+
+    if dash.trace.enabled:
+        dash.trace.dump(dash.settings.INSTRUMENT_OUTPUT)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,144 @@
+"""Single-pass directory scanning for Dash
+
+Each directory is listed exactly once, via ``scandir`` where
+available, and each entry classified as a folder, file or workspace
+using the type information returned by the listing itself along with
+the per-directory metadata index.
+
+Classification:
+    - Entries starting with "." are skipped
+    - Entries filtered out by :data:`dash.filter.listing` are skipped,
+      e.g. those flagged as `hidden`
+    - Folders carrying `Workspace.class` are workspaces
+    - Other folders and files are "disk"
+
+"""
+
+# standard library
+import os
+import collections
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+# local library
+import dash.cache
+import dash.trace
+import dash.filter
+
+WORKSPACE = 'workspace'
+DISK = 'disk'
+
+# Immutable result of a scan, as stored in dash.cache.ListingCache
+Entry = collections.namedtuple('Entry', ['type', 'name', 'group'])
+
+
+@dash.trace.timed('scan.entries')
+def entries(path):
+    """Return (name, isdir) for every non-dot entry in `path`
+
+    Raises:
+        OSError: If `path` could not be listed
+
+    """
+
+    dash.trace.count('listdir')
+
+    if scandir is not None:
+        result = list()
+        for entry in scandir(path):
+            if entry.name.startswith('.'):
+                continue
+
+            try:
+                isdir = entry.is_dir()
+            except OSError:
+                isdir = False
+
+            result.append((entry.name, isdir))
+
+        return result
+
+    # Without scandir, type information costs a stat per entry
+    names = os.listdir(path)
+    dash.trace.count('stat', len(names))
+
+    return [(name, os.path.isdir(os.path.join(path, name)))
+            for name in names
+            if not name.startswith('.')]
+
+
+@dash.trace.timed('scan.scan')
+def scan(path, metadata=None):
+    """Return classified entries of directory at `path`
+
+    Arguments:
+        path (str): Absolute path to directory
+        metadata (dash.cache.MetadataIndex, optional): Index with
+            which to look up `hidden` and `Workspace.class`; defaults
+            to the index shared across Dash.
+
+    Returns:
+        list of Entry, folders and files sorted by name,
+            followed by workspaces.
+
+    Raises:
+        OSError: If `path` could not be listed
+
+    """
+
+    if metadata is None:
+        metadata = dash.cache.metadata
+
+    listing = sorted(entries(path))
+
+    # Only folders may carry metadata
+    folders = [name for name, isdir in listing if isdir]
+    return classify(listing, metadata.directory(path, folders))
+
+
+def classify(listing, values):
+    """Return Entry per visible member of `listing`
+
+    Kept apart from listing, as children may gain or lose metadata
+    without the modification time of their directory changing.
+
+    Arguments:
+        listing (list): (name, isdir) of entries, sorted by name
+        values (dict): Metadata per name, as returned by
+            :meth:`dash.cache.MetadataIndex.directory`
+
+    Returns:
+        list of Entry, folders and files sorted by name,
+            followed by workspaces.
+
+    """
+
+    visible = set(dash.filter.listing.names(
+        [name for name, isdir in listing], values))
+
+    disk = list()
+    workspaces = list()
+
+    for name, isdir in listing:
+        if name not in visible:
+            continue
+
+        keys = values.get(name, {})
+
+        if isdir and dash.cache.WORKSPACE in keys:
+            workspaces.append(Entry(WORKSPACE, name, True))
+        else:
+            disk.append(Entry(DISK, name, isdir))
+
+    return disk + workspaces
+
+
+def display(name):
+    """Return display name of entry `name`, i.e. without extension"""
+    return os.path.splitext(name)[0]
@@ -0,0 +1,335 @@
+"""In-memory search of folders and workspaces
+
+Backs the quick-launch palette, see :mod:`dash.palette`. Basenames
+are indexed by trigram, such that candidates for a query are found
+by intersecting a few posting lists rather than comparing against
+every path.
+
+Queries are split on whitespace; the last word is matched against
+the basename of each entry, and every other word must appear
+somewhere in its path. E.g. "skydivers maya" finds Maya workspaces
+within the job "skydivers".
+
+A last word shorter than three characters, too short for trigrams,
+matches the start of basenames only; longer words match anywhere
+within them.
+
+"""
+
+# standard library
+import os
+import array
+import heapq
+import bisect
+import logging
+import threading
+
+# local library
+import dash.scan
+
+log = logging.getLogger('dash.search')
+
+FOLDER = 'folder'
+WORKSPACE = dash.scan.WORKSPACE
+
+
+def trigrams(text):
+    """Return unique trigrams of `text`"""
+    return set(text[i:i + 3] for i in range(len(text) - 2))
+
+
+class SearchIndex(object):
+    """Trigram index of the basenames of folders and workspaces
+
+    Entries are only ever appended; removed entries are flagged and
+    skipped in results.
+
+    Safe to add to from one thread whilst searching from another.
+
+    """
+
+    def __init__(self):
+        self.paths = list()
+        self.kinds = list()
+        self.lowered = list()
+        self.basenames = list()
+        self.ids = dict()
+        self.grams = dict()
+
+        # Sorted (basename, id), for queries too short for trigrams,
+        # covering identifiers up until `_sorted_until`
+        self._sorted = list()
+        self._sorted_until = 0
+
+        # Sorted (path, id), for removal of everything below a path,
+        # covering identifiers up until `_paths_until`
+        self._paths = list()
+        self._paths_until = 0
+
+        # Text, whether matched by prefix, and matching identifiers
+        # of the previous search, refined rather than recomputed
+        # whilst typing.
+        self._previous = None
+
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, path, kind):
+        """Add `path` of `kind`, unless already present
+
+        Arguments:
+            path (str): Absolute path
+            kind (str): FOLDER or WORKSPACE
+
+        """
+
+        with self._lock:
+            if path in self.ids:
+                identifier = self.ids[path]
+                self.kinds[identifier] = kind
+                return
+
+            identifier = len(self.paths)
+            basename = os.path.basename(path.rstrip('/\\')).lower()
+            self._previous = None
+
+            self.paths.append(path)
+            self.kinds.append(kind)
+            self.lowered.append(path.lower())
+            self.basenames.append(basename)
+            self.ids[path] = identifier
+
+            for gram in trigrams(basename):
+                postings = self.grams.get(gram)
+                if postings is None:
+                    postings = self.grams[gram] = array.array('i')
+                postings.append(identifier)
+
+    def remove(self, path):
+        """Remove `path` along with every entry below it
+
+        Arguments:
+            path (str): Absolute path, e.g. of a removed workspace
+
+        """
+
+        prefix = path.rstrip('/\\')
+        prefixes = (prefix + '/', prefix + '\\')
+
+        with self._lock:
+            removed = list()
+
+            if path in self.ids:
+                removed.append(self.ids[path])
+
+            self._sort_paths()
+
+            for below in prefixes:
+                position = bisect.bisect_left(self._paths, (below,))
+
+                while position < len(self._paths):
+                    candidate, identifier = self._paths[position]
+                    if not candidate.startswith(below):
+                        break
+
+                    removed.append(identifier)
+                    position += 1
+
+            # Entries added since sorting
+            for identifier in range(self._paths_until, len(self.paths)):
+                if self.paths[identifier].startswith(prefixes):
+                    removed.append(identifier)
+
+            for identifier in removed:
+                candidate = self.paths[identifier]
+
+                # Removed already, possibly added anew since
+                if self.ids.get(candidate) != identifier:
+                    continue
+
+                del self.ids[candidate]
+                self.kinds[identifier] = None
+
+    def search(self, text, limit=20):
+        """Return up to `limit` entries matching `text`, best first
+
+        Returns:
+            list of (path, kind)
+
+        """
+
+        words = text.lower().split()
+        if not words:
+            return list()
+
+        last, others = words[-1], words[:-1]
+        prefixed = len(last) < 3
+
+        with self._lock:
+            # Matches of a query by substring are not a superset of
+            # those by prefix, so only refine within the same mode.
+            previous = self._previous
+            if (previous is not None and
+                    previous[1] == prefixed and
+                    text.lower().startswith(previous[0]) and
+                    len(previous[0].split()) == len(words)):
+                candidates = previous[2]
+            else:
+                candidates = self._candidates(last)
+
+            kinds = self.kinds
+            lowered = self.lowered
+            basenames = self.basenames
+
+            matches = list()
+            for identifier in candidates:
+                if kinds[identifier] is None:
+                    continue
+
+                # Refined candidates matched a shorter word
+                basename = basenames[identifier]
+                if prefixed:
+                    if not basename.startswith(last):
+                        continue
+                elif last not in basename:
+                    continue
+
+                path = lowered[identifier]
+                if not all(word in path for word in others):
+                    continue
+
+                matches.append((
+                    # Prefix of basename over anywhere in basename
+                    0 if basename.startswith(last) else 1,
+
+                    # Workspaces over folders
+                    0 if kinds[identifier] == WORKSPACE else 1,
+
+                    # Shallow over deep
+                    path.count('/') + path.count('\\'),
+                    path,
+                    identifier))
+
+            self._previous = (text.lower(),
+                              prefixed,
+                              [match[-1] for match in matches])
+
+            best = heapq.nsmallest(limit, matches)
+            return [(self.paths[match[-1]], kinds[match[-1]])
+                    for match in best]
+
+    def _candidates(self, word):
+        """Return identifiers whose basename contains `word`"""
+        basenames = self.basenames
+
+        # Too short for trigrams, matched by prefix instead
+        if len(word) < 3:
+            self._sort()
+            start = bisect.bisect_left(self._sorted, (word,))
+            result = list()
+
+            for basename, identifier in self._sorted[start:]:
+                if not basename.startswith(word):
+                    break
+                result.append(identifier)
+
+            # Entries added since sorting
+            for identifier in range(self._sorted_until, len(basenames)):
+                if basenames[identifier].startswith(word):
+                    result.append(identifier)
+
+            return result
+
+        postings = list()
+        for gram in trigrams(word):
+            posting = self.grams.get(gram)
+            if posting is None:
+                return list()
+            postings.append(posting)
+
+        # Intersect, starting from the rarest trigram
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if len(candidates) < 64:
+                break
+            candidates.intersection_update(posting)
+
+        return [identifier for identifier in candidates
+                if word in basenames[identifier]]
+
+    def _sort(self):
+        """Sort basenames, once enough have been added since last time"""
+        count = len(self.basenames)
+        if count - self._sorted_until <= count // 10:
+            return
+
+        self._sorted = sorted((basename, identifier)
+                              for identifier, basename
+                              in enumerate(self.basenames))
+        self._sorted_until = count
+
+    def _sort_paths(self):
+        """Sort paths, once enough have been added since last time"""
+        count = len(self.paths)
+        if count - self._paths_until <= count // 10:
+            return
+
+        self._paths = sorted((path, identifier)
+                             for identifier, path in enumerate(self.paths))
+        self._paths_until = count
+
+
+class Builder(object):
+    """Populate `search` from `index` in the background
+
+    Rows added to the persistent index, e.g. by its crawler, are
+    picked up incrementally on each pass.
+
+    Arguments:
+        search (SearchIndex): Index to populate
+        index (dash.index.WorkspaceIndex): Index to read from
+        interval (float): Seconds between passes
+
+    """
+
+    def __init__(self, search, index, interval=10):
+        self.search = search
+        self.index = index
+        self.interval = interval
+
+        self.rowids = {'directories': 0, 'workspaces': 0}
+
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def update(self):
+        """Add rows new to :attr:`index` since the last update"""
+        for table, kind in (('directories', FOLDER),
+                            ('workspaces', WORKSPACE)):
+            for rowid, path in self.index.since(table, self.rowids[table]):
+                self.search.add(path, kind)
+                self.rowids[table] = max(self.rowids[table], rowid)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.update()
+            except Exception:
+                log.exception("Updating search index failed")
+
+            if self._stopped.wait(self.interval):
+                break
@@ -0,0 +1,155 @@
+"""Snapshots of browsing sessions
+
+The listing of every column expanded during a session is saved on
+exit, along with the modification time of each directory at the
+time it was listed. Upon the next launch these listings are served
+immediately, without touching disk, whilst being revalidated in the
+background; only directories that have since changed are read again.
+
+Example:
+    >>> save(model, '/home/marcus/.dash/session.json.gz')
+    >>> restore(model, '/home/marcus/.dash/session.json.gz')
+    ['/projects/job', ...]
+
+"""
+
+# standard library
+import os
+import gzip
+import json
+import logging
+
+# local library
+import dash.scan
+import dash.cache
+
+log = logging.getLogger('dash.session')
+
+VERSION = 2
+
+
+def snapshot(model, size=256):
+    """Return snapshot of columns expanded in `model`
+
+    Arguments:
+        model (dash.model.Model): Model to snapshot
+        size (int): Maximum number of directories to include
+
+    Returns:
+        dict: Root along with (path, mtime, names, entries) per
+            directory; the (name, isdir) of each child along with
+            the entries they were classified as.
+
+    """
+
+    directories = list()
+    seen = set()
+
+    for index, item in list(model.indexes.items()):
+        if len(directories) >= size:
+            break
+
+        if item.data('type') != 'disk' or not item.children:
+            continue
+
+        if index in model.pulling:
+            continue
+
+        path = model.target(item.data('path'))
+        if path in seen:
+            continue
+
+        entry = model.listings.peek(path)
+        if entry is None:
+            continue
+
+        mtime, names = entry
+        listing = model.restored.get(path)
+
+        if listing is None:
+            values = dash.cache.metadata.peek(path)
+            if values is None:
+                continue
+
+            listing = dash.scan.classify(names, values)
+
+        seen.add(path)
+        directories.append((path, mtime,
+                            [list(child) for child in names],
+                            [list(child) for child in listing]))
+
+    root = model.root_item.data('path') if model.root_item else None
+
+    return {'version': VERSION,
+            'root': root,
+            'directories': directories}
+
+
+def save(model, path, size=256):
+    """Write snapshot of `model` to `path`, see :func:`snapshot`"""
+    data = snapshot(model, size)
+
+    directory = os.path.dirname(path)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+
+    # Written aside and moved into place, such that a crash
+    # whilst writing never leaves a partial snapshot behind.
+    temporary = path + '.tmp'
+    with gzip.open(temporary, 'wb') as f:
+        f.write(json.dumps(data, separators=(',', ':')).encode('utf-8'))
+
+    if os.path.exists(path):
+        os.remove(path)
+    os.rename(temporary, path)
+
+    log.info("Saved %i directories to %s" % (len(data['directories']),
+                                              path))
+
+
+def load(path):
+    """Return snapshot saved at `path`, or None if absent or unreadable"""
+    try:
+        with gzip.open(path, 'rb') as f:
+            data = json.loads(f.read().decode('utf-8'))
+    except (IOError, OSError, ValueError) as e:
+        log.debug("No session restored from %s: %s" % (path, e))
+        return None
+
+    if data.get('version') != VERSION:
+        return None
+
+    return data
+
+
+def restore(model, path, root=None):
+    """Seed listings of `model` with the snapshot at `path`
+
+    Listings are restored as they were, and are served by the
+    model as-is until revalidated, see :meth:`Model.revalidate`.
+
+    Arguments:
+        model (dash.model.Model): Model to restore into
+        path (str): Absolute path to snapshot
+        root (str, optional): Only restore a snapshot of this root
+
+    Returns:
+        list: Absolute paths of directories restored
+
+    """
+
+    data = load(path)
+    if data is None:
+        return list()
+
+    if root is not None and data['root'] != root:
+        return list()
+
+    restored = list()
+    for directory, mtime, names, entries in data['directories']:
+        model.listings.put(directory, [tuple(name) for name in names], mtime)
+        model.restored[directory] = [dash.scan.Entry(*entry)
+                                     for entry in entries]
+        restored.append(directory)
+
+    return restored
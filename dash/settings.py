@@ -1,5 +1,53 @@
+import os
+
 WINDOW_SIZE = (700, 400)  # w/h
 WINDOW_POSITION = None
 WINDOW_MINIMUM_SIZE = (400, 300)
 MARGIN = 7  # px
 SPACING = 5  # px
+
+# Model
+ASYNC_PULL = True  # Read from disk in background threads
+PULL_WORKERS = 4  # Concurrent background reads
+PULL_BATCH_SIZE = 100  # Items delivered to the GUI per batch
+LISTING_CACHE_SIZE = 512  # Directories kept in memory
+METADATA_TTL = 1.0  # seconds a directory is trusted by lookups of a node
+
+# Watching of expanded columns for changes on disk
+WATCH = True
+WATCH_BACKEND = 'auto'  # inotify, polling or auto
+WATCH_DEBOUNCE = 250  # ms of quiet before updating a column
+WATCH_LATENCY = 2000  # ms at most before updating a column
+WATCH_INTERVAL = 2.0  # seconds between polls, if polling
+
+# Prefetching of likely-next columns
+PREFETCH_DEPTH = 2  # Levels followed down single-child folders
+PREFETCH_LIMIT = 2  # Prefetches in flight, leaving PULL_WORKERS to pulls
+
+# Creation of workspaces
+CREATE_WORKERS = 8  # Concurrent workspaces being created
+
+# Launching of workspaces
+LAUNCH_WORKERS = 2  # Concurrent launches being resolved
+LAUNCH_UNIQUE = True  # Refuse launching a workspace already running
+LAUNCH_INTERVAL = 5.0  # seconds between launches of a workspace
+
+# Persistent index of workspaces, None to disable
+WORKSPACE_INDEX = os.path.join(os.path.expanduser('~'), '.dash',
+                               'workspaces.db')
+CRAWL_INTERVAL = 300  # seconds between passes of the crawler
+
+# Command-line daemon, see dash.cli
+DAEMON_TOKEN = os.path.join(os.path.expanduser('~'), '.dash',
+                            'daemon.token')
+
+# Junctions
+JUNCTION_DEPTH = 8  # Junctions followed in a chain, before giving up
+
+# Snapshot of expanded columns, restored on launch; None to disable
+SESSION = os.path.join(os.path.expanduser('~'), '.dash', 'session.json.gz')
+SESSION_SIZE = 256  # Directories kept in the snapshot
+
+# Instrumentation of hot paths, see dash.trace
+INSTRUMENT = False
+INSTRUMENT_OUTPUT = None  # Path to JSON written on exit, None to log
@@ -0,0 +1,185 @@
+"""Instrumentation of hot paths
+
+Timing spans wrap operations of interest, such as pulling a column
+or filtering a node, and counters record I/O performed within them;
+each ``stat``, ``listdir`` and read of metadata is attributed to every
+span enclosing it, in the thread it happened.
+
+Disabled by default, in which case a span is a shared no-op and a
+counter a single global lookup.
+
+Example:
+    >>> enable()
+    >>> with span('example'):
+    ...     count('stat')
+    >>> stats()['spans']['example']['stat']
+    1
+
+"""
+
+# standard library
+import json
+import logging
+import functools
+import threading
+import timeit
+
+log = logging.getLogger('dash.trace')
+
+enabled = False
+
+_lock = threading.Lock()
+_local = threading.local()
+
+# Name -> [calls, total seconds, max seconds, {counter: amount}]
+_spans = dict()
+
+# Counter -> amount, regardless of span
+_counters = dict()
+
+
+class _NullSpan(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+_null = _NullSpan()
+
+
+class Span(object):
+    """Time spent in, and I/O performed by, a block of code
+
+    Use via :func:`span` or :func:`timed`.
+
+    """
+
+    __slots__ = ('name', 'started', 'duration', 'counters')
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+        self.duration = None
+        self.counters = dict()
+
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = list()
+
+        stack.append(self)
+        self.started = timeit.default_timer()
+        return self
+
+    def __exit__(self, *args):
+        self.duration = timeit.default_timer() - self.started
+        _local.stack.remove(self)
+
+        with _lock:
+            record = _spans.get(self.name)
+            if record is None:
+                record = _spans[self.name] = [0, 0.0, 0.0, dict()]
+
+            record[0] += 1
+            record[1] += self.duration
+            record[2] = max(record[2], self.duration)
+
+            counters = record[3]
+            for counter, amount in self.counters.items():
+                counters[counter] = counters.get(counter, 0) + amount
+
+
+def span(name):
+    """Return context measuring the block it encloses, as `name`"""
+    if not enabled:
+        return _null
+    return Span(name)
+
+
+def timed(name):
+    """Decorate function, measuring each call as a span of `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+
+            with Span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def count(counter, amount=1):
+    """Add `amount` to `counter`, e.g. "stat", within current spans"""
+    if not enabled:
+        return
+
+    for current in getattr(_local, 'stack', ()):
+        current.counters[counter] = current.counters.get(counter, 0) + amount
+
+    with _lock:
+        _counters[counter] = _counters.get(counter, 0) + amount
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Forget everything recorded so far"""
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def stats():
+    """Return aggregate of everything recorded so far
+
+    Returns:
+        dict: "spans", with calls, total, mean and max seconds along
+            with counters per span, and "counters" overall.
+
+    """
+
+    with _lock:
+        spans = dict()
+        for name, (calls, total, longest, counters) in _spans.items():
+            spans[name] = dict(counters,
+                               calls=calls,
+                               total=total,
+                               mean=total / calls,
+                               max=longest)
+
+        return {'spans': spans, 'counters': dict(_counters)}
+
+
+def dump(path=None):
+    """Write :func:`stats` as JSON to `path`, or to the log if None"""
+    result = stats()
+
+    if path is not None:
+        with open(path, 'w') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        return
+
+    for name, record in sorted(result['spans'].items(),
+                               key=lambda item: -item[1]['total']):
+        counters = ", ".join("%s=%i" % (counter, amount)
+                             for counter, amount in sorted(record.items())
+                             if counter not in ('calls', 'total',
+                                                'mean', 'max'))
+
+        log.info("%-32s %6i calls %9.1f ms total %7.2f ms max  %s" % (
+            name, record['calls'], record['total'] * 1000,
+            record['max'] * 1000, counters))
@@ -1,14 +1,18 @@
 import os
 
-import dash.delegate
 import pigui.pyqt5.widgets.list.view
 
 import pigui.pyqt5.model
 
+import dash.trace
+
 DefaultList = pigui.pyqt5.widgets.list.view.DefaultList
 
 
+@dash.trace.timed('view.create_delegate')
 def create_delegate(self, index):
+    import dash.delegate
+
     typ = self.model.data(index, 'type')
 
     if typ == 'disk':
@@ -29,10 +33,17 @@ def create_delegate(self, index):
     elif typ == 'Header':
         parent = self.model.data(index, 'parent')
         path = self.model.data(parent, 'path')
+        header = super(DefaultList, self).create_delegate(index)
+
         if os.path.exists(os.path.join(path, '.meta')):
-            header = super(DefaultList, self).create_delegate(index)
             header.setProperty('hasMetadata', True)
-            return header
+
+        if self.model.data(parent, 'loading'):
+            header.setProperty('loading', True)
+            indicator = dash.delegate.LoadingIndicator(parent, header)
+            self.model.loaded.connect(indicator.loaded_event)
+
+        return header
 
     return super(DefaultList, self).create_delegate(index)
 
@@ -0,0 +1,314 @@
+"""File-system watching for Dash
+
+Keeps expanded columns up to date with changes made on disk, such as
+shots added or workspaces created by other artists.
+
+Changes are reported by a backend running in a background thread;
+inotify where available, polling of modification times otherwise.
+Bursts of changes, such as a folder being copied in, are debounced
+and coalesced into a single notification per directory.
+
+"""
+
+# standard library
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+
+# pigui dependency
+from PyQt5 import QtCore
+
+log = logging.getLogger('dash.watch')
+
+
+class PollingBackend(object):
+    """Detect changes by polling the modification time of directories
+
+    Arguments:
+        callback (callable): Called with path of changed directory,
+            from the polling thread.
+        interval (float): Seconds between polls
+
+    """
+
+    def __init__(self, callback, interval=2.0):
+        self.callback = callback
+        self.interval = interval
+
+        self._mtimes = dict()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def watch(self, path):
+        with self._lock:
+            self._mtimes[path] = self._mtime(path)
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._poll)
+            self._thread.daemon = True
+            self._thread.start()
+
+    def unwatch(self, path):
+        with self._lock:
+            self._mtimes.pop(path, None)
+
+    def stop(self):
+        self._stopped.set()
+
+    def _poll(self):
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                paths = list(self._mtimes.items())
+
+            for path, previous in paths:
+                current = self._mtime(path)
+                if current == previous:
+                    continue
+
+                with self._lock:
+                    if path not in self._mtimes:
+                        continue
+                    self._mtimes[path] = current
+
+                self.callback(path)
+
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+
+class InotifyBackend(object):
+    """Detect changes via Linux inotify
+
+    Costs nothing whilst idle; the reading thread blocks until
+    the kernel reports an event.
+
+    Arguments:
+        callback (callable): Called with path of changed directory,
+            from the reading thread.
+
+    Raises:
+        OSError: If inotify is unavailable
+
+    """
+
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+
+    MASK = (IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE |
+            IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+
+    _header = struct.Struct('iIII')
+
+    def __init__(self, callback):
+        import ctypes
+        import ctypes.util
+
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify is only available on Linux")
+
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6',
+                           use_errno=True)
+
+        fd = libc.inotify_init()
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init failed")
+
+        self.callback = callback
+
+        self._libc = libc
+        self._fd = fd
+        self._paths = dict()  # wd -> path
+        self._descriptors = dict()  # path -> wd
+        self._lock = threading.Lock()
+        self._stopped = False
+
+        self._thread = threading.Thread(target=self._read)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def watch(self, path):
+        import ctypes
+
+        encoded = path.encode(sys.getfilesystemencoding() or 'utf-8')
+        wd = self._libc.inotify_add_watch(self._fd, encoded, self.MASK)
+
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+
+        with self._lock:
+            self._paths[wd] = path
+            self._descriptors[path] = wd
+
+    def unwatch(self, path):
+        with self._lock:
+            wd = self._descriptors.pop(path, None)
+            self._paths.pop(wd, None)
+
+        if wd is not None:
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def stop(self):
+        self._stopped = True
+        os.close(self._fd)
+
+    def _read(self):
+        while not self._stopped:
+            try:
+                select.select([self._fd], [], [])
+                buffer = os.read(self._fd, 64 * 1024)
+            except (OSError, select.error) as e:
+                if e.args and e.args[0] == errno.EINTR:
+                    continue
+                if not self._stopped:
+                    log.exception("inotify stopped unexpectedly")
+                return
+
+            changed = set()
+            offset = 0
+
+            while offset < len(buffer):
+                wd, mask, cookie, length = self._header.unpack_from(
+                    buffer, offset)
+                offset += self._header.size + length
+
+                with self._lock:
+                    path = self._paths.get(wd)
+
+                    if mask & self.IN_IGNORED:
+                        self._paths.pop(wd, None)
+                        self._descriptors.pop(path, None)
+
+                if path is not None:
+                    changed.add(path)
+
+            for path in changed:
+                self.callback(path)
+
+
+def backend(callback, interval=2.0, kind='auto'):
+    """Return backend of `kind`
+
+    Arguments:
+        callback (callable): Called with path of changed directory
+        interval (float): Seconds between polls, if polling
+        kind (str): "inotify", "polling" or "auto" for the best
+            one available on this platform.
+
+    .. note:: inotify only sees changes made by this machine on
+        network shares, such as SMB; use polling for those.
+
+    """
+
+    if kind in ('auto', 'inotify'):
+        try:
+            return InotifyBackend(callback)
+        except (OSError, AttributeError) as e:
+            if kind == 'inotify':
+                raise
+            log.info("Falling back to polling: %s" % e)
+
+    return PollingBackend(callback, interval)
+
+
+class Watcher(QtCore.QObject):
+    """Watch directories and emit coalesced changes in the GUI thread
+
+    Signals:
+        changed (str): Emitted once per changed directory, after
+            changes have settled for `debounce` milliseconds, or
+            at the latest after `latency` milliseconds.
+
+    Arguments:
+        debounce (int): Milliseconds of quiet before emitting
+        latency (int): Maximum milliseconds to hold on to a change
+        interval (float): Seconds between polls, if polling
+        kind (str): Backend, see :func:`backend`
+
+    """
+
+    changed = QtCore.pyqtSignal(str)
+
+    # Emitted from backend thread, handled in the GUI thread
+    dirty = QtCore.pyqtSignal(str)
+
+    def __init__(self, debounce=250, latency=2000, interval=2.0,
+                 kind='auto', parent=None):
+        super(Watcher, self).__init__(parent)
+
+        self.debounce = debounce
+        self.latency = latency
+        self.pending = set()
+        self.since = None
+
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(debounce)
+        timer.timeout.connect(self.flush)
+
+        self.timer = timer
+        self.backend = backend(self.dirty.emit, interval, kind)
+        self.watched = set()
+
+        self.dirty.connect(self.dirty_event)
+
+    def watch(self, path):
+        """Start watching directory at `path`"""
+        if path in self.watched:
+            return
+
+        try:
+            self.backend.watch(path)
+        except OSError as e:
+            log.warning("Could not watch %s: %s" % (path, e))
+        else:
+            self.watched.add(path)
+
+    def unwatch(self, path):
+        """Stop watching directory at `path`"""
+        if path not in self.watched:
+            return
+
+        self.watched.discard(path)
+        self.backend.unwatch(path)
+
+    def stop(self):
+        self.timer.stop()
+        self.backend.stop()
+
+    def dirty_event(self, path):
+        if path not in self.watched:
+            return
+
+        if not self.pending:
+            self.since = time.time()
+
+        self.pending.add(path)
+
+        # Restart the timer, unless changes have been held long enough
+        held = (time.time() - self.since) * 1000
+        if held < self.latency or not self.timer.isActive():
+            self.timer.start(self.debounce)
+
+    def flush(self):
+        pending, self.pending = self.pending, set()
+        self.since = None
+
+        for path in pending:
+            self.changed.emit(path)
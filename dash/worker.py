@@ -0,0 +1,277 @@
+"""Background workers for Dash
+
+Reading from disk and metadata is slow on network storage and
+mustn't happen on the GUI thread. Work is handed to a :class:`Pool`
+of daemon threads; results are delivered back to Qt via signals
+emitted from the worker, which Qt queues onto the receiving thread.
+
+Work is scheduled by priority, such that the column the user just
+opened is read before columns being refreshed, which in turn are
+read before anything speculative. Requests for the same work, by
+key, are merged into a single :class:`Task`, see :meth:`Pool.request`.
+
+"""
+
+# standard library
+import logging
+import threading
+import itertools
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+log = logging.getLogger('dash.worker')
+
+_local = threading.local()
+
+# Priorities, most urgent first
+FOCUS = 0  # The column just opened
+VISIBLE = 1  # Columns on screen, e.g. refreshed after a change on disk
+NORMAL = 2
+BACKGROUND = 3  # Speculative work, e.g. prefetching and revalidation
+
+
+def current():
+    """Return the :class:`Task` running in the calling thread, if any"""
+    return getattr(_local, 'task', None)
+
+
+class Task(object):
+    """Handle to a unit of work submitted to a :class:`Pool`
+
+    Attributes:
+        cancelled (bool): Set via :meth:`cancel`; long-running
+            functions are expected to poll this, via :func:`current`,
+            and return early.
+        priority (int): One of FOCUS, VISIBLE, NORMAL or BACKGROUND
+        key (object): Identity of the work, for merging requests
+        result (object): Return value of the function, once finished
+        finished (threading.Event): Set once run, or skipped
+
+    """
+
+    def __init__(self, func, args, kwargs, priority=NORMAL, key=None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.key = key
+        self.cancelled = False
+        self.started = False
+        self.result = None
+        self.finished = threading.Event()
+        self.requests = list()
+        self.pool = None
+
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def claim(self):
+        """Mark as started, returning False if already started"""
+        with self._lock:
+            if self.started:
+                return False
+            self.started = True
+            return True
+
+    def run(self):
+        if self.cancelled:
+            return
+
+        _local.task = self
+
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+        except Exception:
+            log.exception("Task %r failed" % self.func)
+        finally:
+            _local.task = None
+
+    def wait(self, timeout=None):
+        """Block until finished, running it here if not yet started
+
+        Safe to call from within a worker of the same pool; work
+        not yet picked up by another worker is run inline rather
+        than waited for.
+
+        """
+
+        if self.pool is not None and self.claim():
+            self.pool.execute(self)
+        else:
+            self.finished.wait(timeout)
+
+        return self.result
+
+
+class Request(object):
+    """Interest of a single caller in a possibly shared :class:`Task`
+
+    The task is only cancelled once every request for it has been.
+
+    """
+
+    def __init__(self, task, callback=None):
+        self.task = task
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        # Under the lock of the pool, such that a request joining
+        # the task at the same time is either cancelled along with
+        # it, or keeps it alive.
+        with self.task.pool.lock:
+            self.cancelled = True
+
+            if all(request.cancelled for request in self.task.requests):
+                self.task.cancel()
+
+
+class Pool(object):
+    """Fixed-size pool of daemon threads, run by priority
+
+    Threads are started lazily upon first submission so as to not
+    cost anything for models that never use them.
+
+    Arguments:
+        workers (int): Maximum number of concurrent threads
+
+    """
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        self.queue = queue.PriorityQueue()
+        self.threads = list()
+        self.lock = threading.Lock()
+
+        # Tasks queued or running, by key
+        self.inflight = dict()
+        self._sequence = itertools.count()
+
+    def submit(self, func, *args, **kwargs):
+        """Run `func` with `args` and `kwargs` in a background thread
+
+        Returns:
+            Task: Handle with which to cancel the work
+
+        """
+
+        task = Task(func, args, kwargs)
+        self._enqueue(task)
+        return task
+
+    def request(self, key, func, args=(), callback=None,
+                priority=NORMAL, fresh=False):
+        """Run `func` for `key`, merging with identical requests
+
+        Should a task for `key` already be queued or running, it is
+        shared rather than started anew, and raised to `priority`
+        if more urgent.
+
+        Arguments:
+            key (object): Identity of the work, e.g. ("children", path),
+                or None for work never shared.
+            func (callable): Function to run, given `args`
+            args (tuple): Arguments passed to `func`
+            callback (callable, optional): Called with the request
+                and result of `func` from the worker thread, unless
+                the request is cancelled.
+            priority (int): One of FOCUS, VISIBLE, NORMAL or BACKGROUND
+            fresh (bool): Only share a task that has not yet started,
+                e.g. when results from before now would be outdated.
+
+        Returns:
+            Request: Handle with which to cancel interest in the work
+
+        """
+
+        with self.lock:
+            task = self.inflight.get(key)
+
+            if (task is None or task.cancelled or
+                    (fresh and task.started)):
+                task = Task(func, args, dict(), priority, key)
+                task.pool = self
+                enqueue = True
+
+                if key is not None:
+                    self.inflight[key] = task
+
+            else:
+                # Queued anew, the earlier entry is skipped once dequeued
+                enqueue = priority < task.priority and not task.started
+                task.priority = min(priority, task.priority)
+
+            request = Request(task, callback)
+            task.requests.append(request)
+
+        if enqueue:
+            self._enqueue(task)
+
+        return request
+
+    def execute(self, task):
+        """Run claimed `task` and notify requests of its result"""
+        task.run()
+
+        with self.lock:
+            if self.inflight.get(task.key) is task:
+                del self.inflight[task.key]
+
+            requests = list(task.requests)
+
+        task.finished.set()
+
+        if task.cancelled:
+            return
+
+        for request in requests:
+            if request.cancelled or request.callback is None:
+                continue
+
+            try:
+                request.callback(request, task.result)
+            except Exception:
+                log.exception("Callback of %r failed" % task.func)
+
+    def _enqueue(self, task):
+        task.pool = self
+        self.queue.put((task.priority, next(self._sequence), task))
+
+        with self.lock:
+            if len(self.threads) < self.workers:
+                thread = threading.Thread(target=self._work)
+                thread.daemon = True
+                thread.start()
+                self.threads.append(thread)
+
+    def _work(self):
+        while True:
+            priority, sequence, task = self.queue.get()
+
+            # Raised in priority, or run elsewhere already
+            if priority != task.priority or not task.claim():
+                continue
+
+            self.execute(task)
+
+
+_io = None
+_io_lock = threading.Lock()
+
+
+def io():
+    """Return the pool shared by reads of the model and filters"""
+    global _io
+
+    with _io_lock:
+        if _io is None:
+            # Deferred, as settings are commonly altered prior to use
+            import dash.settings
+            _io = Pool(dash.settings.PULL_WORKERS)
+
+    return _io
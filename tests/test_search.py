@@ -0,0 +1,46 @@
+import unittest
+
+import dash.search
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = dash.search.SearchIndex()
+        self.index.add('/c/job/010_shot', dash.search.FOLDER)
+        self.index.add('/c/job/shot_020', dash.search.FOLDER)
+
+    def paths(self, text):
+        return sorted(path for path, kind in self.index.search(text))
+
+    def test_typing_matches_searching_directly(self):
+        """Refining a match by prefix doesn't lose matches by substring"""
+        for text in ('s', 'sh', 'sho'):
+            typed = self.paths(text)
+
+        self.assertEqual(typed, ['/c/job/010_shot', '/c/job/shot_020'])
+
+    def test_refining_substring_matches(self):
+        self.assertEqual(self.paths('sho'),
+                         ['/c/job/010_shot', '/c/job/shot_020'])
+        self.assertEqual(self.paths('shot_'), ['/c/job/shot_020'])
+
+    def test_short_query_matches_prefix(self):
+        self.assertEqual(self.paths('sh'), ['/c/job/shot_020'])
+
+    def test_remove(self):
+        self.index.add('/c/job/shot_020/maya', dash.search.WORKSPACE)
+        self.index.remove('/c/job/shot_020')
+
+        self.assertEqual(self.paths('sho'), ['/c/job/010_shot'])
+        self.assertEqual(self.paths('maya'), [])
+
+    def test_remove_then_add(self):
+        """An entry added anew after a rename is found again"""
+        self.index.remove('/c/job')
+        self.index.add('/c/job/shot_020', dash.search.FOLDER)
+
+        self.assertEqual(self.paths('sho'), ['/c/job/shot_020'])
+
+
+if __name__ == '__main__':
+    unittest.main()